@@ -0,0 +1,132 @@
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, simplex_module falls back to the NumPy implementation
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+# The table changes its shape with every Gomory clipping and becomes a non-contiguous view after the r variables
+# are cut off. Numba specializes on the array layout and not on the shape, so every kernel is compiled eagerly
+# for a single any-layout signature that is reused for all the tables instead of compiling a C and an A variant
+
+
+@njit('int64(int64, int64)', cache=True)
+def _gcd(a, b):
+    a, b = abs(a), abs(b)
+    while b != 0:
+        a, b = b, a % b
+    return a
+
+
+@njit('boolean(int64[:, :])', cache=True)
+def check_condition(num):
+    """
+    Checks the optimality condition of the objective function
+    (all values in the row of the objective function, except for b, are negative or equal to zero)
+    :param num: numerators of the simplex table
+    :return: condition (bool): True if the optimality condition is met, False otherwise
+    """
+    for j in range(num.shape[1] - 1):
+        if num[0, j] > 0:
+            return False
+    return True
+
+
+@njit('int64(int64[:, :])', cache=True)
+def find_key_column(num):
+    """
+    Find the resolving column: the last column with the maximal positive value in the row of the objective function.
+    The row shares a single positive denominator, so only the numerators are compared
+    :param num: numerators of the simplex table
+    :return: key_column (int): index of the resolving column
+    """
+    key_column = 0
+    for j in range(num.shape[1] - 1):
+        if num[0, j] >= num[0, key_column]:
+            key_column = j
+    return key_column
+
+
+@njit('int64(int64[:, :], int64)', cache=True)
+def find_key_row(num, key_column):
+    """
+    Search for a permissive row in the permissive column by the minimal ratio test.
+    The row denominator cancels out in the ratio b / a, the ratios are compared exactly by cross-multiplication.
+    :param num: numerators of the simplex table
+    :param key_column: index of the resolving column
+    :return: key_row (int): index of the resolving row, 0 if the column contains no positive elements
+    """
+    key_row = 0
+    min_num, min_den = 0, 1
+    for i in range(1, num.shape[0]):
+        if num[i, key_column] > 0:
+            ratio_num = num[i, -1]
+            ratio_den = num[i, key_column]
+            if key_row == 0 or ratio_num * min_den < min_num * ratio_den:
+                key_row = i
+                min_num, min_den = ratio_num, ratio_den
+    return key_row
+
+
+@njit('void(int64[:, :], int64[:], int64, int64)', cache=True)
+def _reduce_row(num, den, i, num_columns):
+    g = den[i]
+    for j in range(num_columns):
+        if g == 1:
+            return
+        g = _gcd(g, num[i, j])
+    for j in range(num_columns):
+        num[i, j] //= g
+    den[i] //= g
+
+
+@njit('int64(int64[:, :], int64[:], int64, int64, int64, int64)', cache=True)
+def _eliminate_row(num, den, i, key_row, key_column, num_columns):
+    # returns the largest absolute value of the changed row, 0 if the row is left unchanged
+    factor = num[i, key_column]
+    if factor == 0:
+        return 0
+    for j in range(num_columns):
+        num[i, j] = num[i, j] * den[key_row] - factor * num[key_row, j]
+    den[i] *= den[key_row]
+    _reduce_row(num, den, i, num_columns)
+    magnitude = den[i]
+    for j in range(num_columns):
+        magnitude = max(magnitude, abs(num[i, j]))
+    return magnitude
+
+
+@njit('int64(int64[:, :], int64[:], int64, int64)', cache=True)
+def pivot(num, den, key_row, key_column):
+    """
+    Performs the Jordan-Gauss elimination in place:
+    divides the resolving row by the resolving element and zeroes the other elements of the resolving column.
+    Every row i stores the values num[i, :] / den[i], so the division only replaces the row denominator.
+    The values of the table must be within table_tools.INT64_BOUND, then the products do not overflow
+    :param num: numerators of the simplex table
+    :param den: row denominators of the simplex table
+    :param key_row: index of the permissive row
+    :param key_column: index of the permissive column
+    :return: magnitude (int): the largest absolute value of the changed rows,
+     the table has to be converted to Python ints before the next step if it exceeds INT64_BOUND
+    """
+    num_rows, num_columns = num.shape
+    pivot_num = num[key_row, key_column]
+    if pivot_num < 0:
+        for j in range(num_columns):
+            num[key_row, j] = -num[key_row, j]
+        pivot_num = -pivot_num
+    den[key_row] = pivot_num
+    _reduce_row(num, den, key_row, num_columns)
+    # the rows above and below the resolving one are processed by separate loops without the i != key_row branch
+    magnitude = den[key_row]
+    for i in range(key_row):
+        magnitude = max(magnitude, _eliminate_row(num, den, i, key_row, key_column, num_columns))
+    for i in range(key_row + 1, num_rows):
+        magnitude = max(magnitude, _eliminate_row(num, den, i, key_row, key_column, num_columns))
+    return magnitude
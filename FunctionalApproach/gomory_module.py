@@ -1,9 +1,10 @@
-import copy
-from FunctionalApproach.simplex_module import simplex_step, simplex_solve
+import numpy as np
+from FunctionalApproach.simplex_module import simplex_step, _simplex_solve, _feasible_table, _optimize
+from FunctionalApproach.table_tools import reduce_rows, snapshot, allocate_table, add_row_and_column, argmin_ratio
 from FunctionalApproach.utils import get_fraction, create_solution
 
 
-def gomory_solve(num_vars: int, constraints: list, objective_function: tuple):
+def gomory_solve(num_vars: int, constraints: list, objective_function: tuple, record_history: bool = False):
     """
     Solve the problem of integer linear programming by given constraints and an objective function.
     Initially, the condition of the integer value of the solution obtained by the simplex method is checked,
@@ -18,74 +19,120 @@ def gomory_solve(num_vars: int, constraints: list, objective_function: tuple):
          (for example ['1x_1 + 2x_2 >= 4', '2x_3 + 3x_1 <= 5', 'x_3 + 3x_2 = 6'])
     :param objective_function: tuple in which two string values are specified: objective function
          (for example, '2x_1 + 4x_3 + 5x_2') optimization direction ('min' or 'max')
+    :param record_history: if True, the simplex table and basic variables are saved after each step
     :return:
     integer_optimum (float): the optimal integer value of the objective function obtained by the Gomori method
     integer_optimal_plane (list): the optimal integer plan obtained by the Gomori method
-    gomory_history (list): a list containing the steps of simplex table conversion
-    basic_vars_history (list): a list containing the steps of basic_vars conversion
+    gomory_history (list): a list containing the steps of simplex table conversion (empty if record_history is False)
+    basic_vars_history (list): a list containing the steps of basic_vars conversion (empty if record_history is False)
     """
-    simplex_vals, simplex_solution, simplex_history, simplex_basic_vars_history = simplex_solve(
+    simplex_table, basic_vars, gomory_history, basic_vars_history = _simplex_solve(
         num_vars,
         constraints,
-        objective_function
+        objective_function,
+        record_history
     )
-    simplex_table = list(simplex_history.values())[-1]
-    basic_vars = list(simplex_basic_vars_history.values())[-1]
+    return _integer_optimize(simplex_table, basic_vars, num_vars, gomory_history, basic_vars_history, record_history)
 
-    gomory_history = simplex_history
-    basic_vars_history = simplex_basic_vars_history
+
+def gomory_solve_batch(num_vars: int, constraints: list, objective_functions: list, record_history: bool = False):
+    """
+    Solve several problems of integer linear programming with the same constraints and different objective functions.
+    The constraints are parsed and the first phase of the simplex method is performed only once,
+    every objective function starts the second phase from a copy of the resulting feasible plan
+    :param num_vars: number of variables
+    :param constraints: list of constraints
+         (for example ['1x_1 + 2x_2 >= 4', '2x_3 + 3x_1 <= 5', 'x_3 + 3x_2 = 6'])
+    :param objective_functions: list of tuples in which two string values are specified: objective function
+         (for example, '2x_1 + 4x_3 + 5x_2') optimization direction ('min' or 'max')
+    :param record_history: if True, the simplex table and basic variables are saved after each step
+    :return: results (list): results of gomory_solve for every objective function, in the same order
+    """
+    feasible_table, feasible_basic_vars = _feasible_table(num_vars, constraints)
+    results = []
+    for objective_function in objective_functions:
+        simplex_table, basic_vars, gomory_history, basic_vars_history = _optimize(
+            snapshot(feasible_table),
+            feasible_basic_vars[:],
+            objective_function,
+            record_history
+        )
+        results.append(_integer_optimize(
+            simplex_table,
+            basic_vars,
+            num_vars,
+            gomory_history,
+            basic_vars_history,
+            record_history
+        ))
+    return results
+
+
+def _integer_optimize(simplex_table: tuple, basic_vars: list, num_vars: int, gomory_history: dict,
+                      basic_vars_history: dict, record_history: bool):
+    """
+    Runs the Gomory method from the optimal simplex table of the linear programming problem
+    :return: the same values as gomory_solve
+    """
     if check_integer_condition(simplex_table):
-        return simplex_table[0][-1], simplex_solution
-    gomory_history[f'Initial Gomory-method'] = copy.deepcopy(simplex_table)
-    basic_vars_history[f'Initial Gomory-method'] = copy.deepcopy(basic_vars)
+        integer_optimum = get_fraction(simplex_table[0][0, -1], simplex_table[1][0])
+        integer_optimal_plane = create_solution(simplex_table, basic_vars, num_vars)
+        return integer_optimum, integer_optimal_plane, gomory_history, basic_vars_history
+    if record_history:
+        gomory_history[f'Initial Gomory-method'] = snapshot(simplex_table)
+        basic_vars_history[f'Initial Gomory-method'] = basic_vars[:]
+    # every clipping adds a row and a column, the table is kept in buffers with spare space for them
+    buffer, simplex_table = allocate_table(simplex_table, len(simplex_table[1]))
     step = 1
     while not check_integer_condition(simplex_table):
-        simplex_table, basic_vars = add_clipping(simplex_table, basic_vars)
+        simplex_table, basic_vars, buffer = _add_clipping(simplex_table, basic_vars, buffer)
         key_row = get_key_row(simplex_table)
         key_column = get_key_column(simplex_table, key_row)
         simplex_table, basic_vars = simplex_step(simplex_table, basic_vars, key_column, key_row)
-        gomory_history[f'Gomory method step {step}'] = copy.deepcopy(simplex_table)
-        basic_vars_history[f'Gomory method step {step}'] = copy.deepcopy(basic_vars)
+        if record_history:
+            gomory_history[f'Gomory method step {step}'] = snapshot(simplex_table)
+            basic_vars_history[f'Gomory method step {step}'] = basic_vars[:]
         step += 1
-    integer_optimum = simplex_table[0][-1]
+    integer_optimum = get_fraction(simplex_table[0][0, -1], simplex_table[1][0])
     integer_optimal_plane = create_solution(simplex_table, basic_vars, num_vars)
 
     return integer_optimum, integer_optimal_plane, gomory_history, basic_vars_history
 
 
-def check_integer_condition(simplex_table: list):
+def check_integer_condition(simplex_table: tuple):
     """
     Checks the condition of integer optimality of the objective function
     (all values in the row of the objective function of the current simplex table are negative or equal to 0 and are integer)
     :param simplex_table: current simplex table
     :return: condition (bool): True or False, depending on the fulfillment of the integer optimality condition
     """
-    B = [x[-1] for x in simplex_table[1:]]
-    integer_values = list(filter(lambda x: x.denominator == 1, B))
-    positive_values = list(filter(lambda x: x >= 0, B))
-    condition1 = len(positive_values) == len(B)
-    condition2 = len(integer_values) == len(B)
-    condition = condition1 and condition2
+    num, den = simplex_table
+    condition = bool(np.all((num[1:, -1] >= 0) & (num[1:, -1] % den[1:] == 0)))
     return condition
 
 
-def find_max_fractional_index(simplex_table: list):
+def find_max_fractional_index(simplex_table: tuple):
     """
     Searches for the index of the row of the current simplex table in which the
     maximum value of the fractional part of the element is located
     :param simplex_table: current simplex table
     :return: max_fractional_index (int): index of the row containing the element with the maximum fractional part
     """
+    num, den = simplex_table
+    b_num = np.abs(num[:, -1]).tolist()
+    b_den = den.tolist()
+    # fractional parts are kept as exact numerators over b_den and compared by cross-multiplication
     max_fractional_part_i = 1
-    for i in range(1, len(simplex_table)):
-        curr_fractional_part = abs(float(simplex_table[i][-1])) % 1
-        max_fractional_part = abs(float(simplex_table[max_fractional_part_i][-1])) % 1
-        if curr_fractional_part > max_fractional_part:
+    max_fractional_part = b_num[1] % b_den[1]
+    for i in range(2, len(b_num)):
+        curr_fractional_part = b_num[i] % b_den[i]
+        if curr_fractional_part * b_den[max_fractional_part_i] > max_fractional_part * b_den[i]:
             max_fractional_part_i = i
+            max_fractional_part = curr_fractional_part
     return max_fractional_part_i
 
 
-def add_clipping(simplex_table: list, basic_vars: list):
+def add_clipping(simplex_table: tuple, basic_vars: list):
     """
     Forms a new clipping of the Gomori method:
     - searching for a string containing an element with the maximum fractional part,
@@ -99,40 +146,63 @@ def add_clipping(simplex_table: list, basic_vars: list):
     simplex_table: new simplex table
     basic_vars: new basic variables
     """
-    index = find_max_fractional_index(simplex_table)
-    simplex_table.append([0 for _ in simplex_table[0]])
-    for i in range(len(simplex_table)):
-        if i == len(simplex_table) - 1:
-            simplex_table[i].insert(-1, 1)
-        else:
-            simplex_table[i].insert(-1, 0)
-    for j, coeff in enumerate(simplex_table[index]):
-        if coeff != 0:
-            simplex_table[-1][j] = get_fraction(-(coeff.numerator % coeff.denominator), coeff.denominator)
-    basic_vars.append(len(simplex_table) - 1)
+    buffer, simplex_table = allocate_table(simplex_table, 1)
+    simplex_table, basic_vars, buffer = _add_clipping(simplex_table, basic_vars, buffer)
     return simplex_table, basic_vars
 
 
-def get_key_row(simplex_table: list):
-    beta = [x[-1] if x[-1] < 0 else 0 for x in simplex_table[1:]]
-    key_row = 0
-    for b in range(len(beta)):
-        if abs(beta[b]) >= abs(beta[key_row]):
-            key_row = b
-    return key_row + 1
-
-
-def get_key_column(simplex_table: list, key_row: int):
-    tetha = [x / y if y < 0 else float('inf') for x, y in
-             zip(simplex_table[0][:-2], simplex_table[key_row][:-2])]
-    key_column = 0
-    for t in range(len(tetha)):
-        if tetha[t] <= tetha[key_column]:
-            key_column = t
-    return key_column
-
-
+def _add_clipping(simplex_table: tuple, basic_vars: list, buffer: tuple):
+    """
+    Adds a new clipping of the Gomori method as add_clipping does, the new row and column are taken from the buffers
+    :param simplex_table: current simplex table, a view of the buffers
+    :param basic_vars: current basic vars
+    :param buffer: buffers holding the simplex table (see allocate_table)
+    :return:
+    simplex_table: new simplex table
+    basic_vars: new basic variables
+    buffer: buffers holding the new simplex table
+    """
+    index = find_max_fractional_index(simplex_table)
+    buffer, simplex_table = add_row_and_column(buffer, simplex_table)
+    num, den = simplex_table
+    clipping_num = -(num[index] % den[index])
+    clipping_num[-2] = den[index]
+    num[-1], den[-1] = reduce_rows(clipping_num, den[index])
+    basic_vars.append(len(num) - 1)
+    return simplex_table, basic_vars, buffer
 
 
+def get_key_row(simplex_table: tuple):
+    """
+    Searches for the resolving row of the dual simplex step: the row with the largest negative b.
+    Ties are resolved in favour of the smallest index, which keeps the choice consistent between iterations
+    as the finiteness argument of the Gomory method requires
+    :param simplex_table: current simplex table
+    :return: key_row (int): index of the resolving row
+    """
+    num, den = simplex_table
+    # only the negative values of b are candidates, they are compared exactly by argmin_ratio
+    rows = np.flatnonzero(num[1:, -1] < 0) + 1
+    if len(rows) == 0:
+        return 1
+    return int(rows[argmin_ratio(num[rows, -1], den[rows])])
 
 
+def get_key_column(simplex_table: tuple, key_row: int):
+    """
+    Searches for the resolving column of the dual simplex step: the column with the minimal ratio
+    tetha = F / a of the row of the objective function to the negative elements of the resolving row.
+    Ties are resolved in favour of the largest index, if there are no negative elements the last column is taken
+    :param simplex_table: current simplex table
+    :param key_row: index of the resolving row
+    :return: key_column (int): index of the resolving column
+    """
+    num, den = simplex_table
+    x = num[0, :-2]
+    y = num[key_row, :-2]
+    # tetha = (x / den[0]) / (y / den[key_row]), the positive factor den[key_row] / den[0] is common to all the columns,
+    # so x / y = -x / -y are compared exactly by argmin_ratio, the denominators -y of the candidates are positive
+    columns = np.flatnonzero(y < 0)
+    if len(columns) == 0:
+        return len(x) - 1
+    return int(columns[argmin_ratio(-x[columns], -y[columns], last=True)])
@@ -9,7 +9,8 @@ if __name__ == '__main__':
     gomory_vals, gomory_solution, gomory_history, basic_vars_history = gomory_solve(
         num_vars,
         constraints,
-        objective_function
+        objective_function,
+        record_history=True
     )
     print('Gomory method steps:')
     print_history_table(gomory_history, basic_vars_history, gomory_solution)
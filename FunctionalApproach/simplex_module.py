@@ -1,10 +1,13 @@
 from warnings import warn
-import copy
-from FunctionalApproach.table_tools import sum_rows, multiply_const_row
-from FunctionalApproach.utils import construct_simplex_table, update_objective_function, create_solution
+import numpy as np
+from FunctionalApproach import _simplex_numba
+from FunctionalApproach.table_tools import axpy, reduce_rows, snapshot, exact_table, to_python_ints, argmin_ratio, \
+    INT64_BOUND
+from FunctionalApproach.utils import construct_simplex_table, update_objective_function, create_solution, get_fraction, \
+    exact_fraction
 
 
-def simplex_solve(num_vars: int, constraints: list, objective_function: tuple):
+def simplex_solve(num_vars: int, constraints: list, objective_function: tuple, record_history: bool = False):
     """
     Solve the problem of linear programming by the simplex method.
     In the method body of each iteration of the loop, the optimality condition of the objective function is
@@ -16,95 +19,151 @@ def simplex_solve(num_vars: int, constraints: list, objective_function: tuple):
         (for example ['1x_1 + 2x_2 >= 4', '2x_3 + 3x_1 <= 5', 'x_3 + 3x_2 = 6'])
     :param objective_function: tuple in which two string values are specified: objective function
         (for example, '2x_1 + 4x_3 + 5x_2') optimization direction ('min' or 'max')
+    :param record_history: if True, the simplex table and basic variables are saved after each step
     :return:
     optimum (float) – the optimal value of the objective function obtained by the simplex method
     optimal_plane (dict) - optimal plan obtained by simplex method (solution of linear programming problem)
+    simplex_history (list): list containing the steps of simplex table conversion (empty if record_history is False)
+    basic_vars_history (list): list containing the steps of basic_vars conversion (empty if record_history is False)
+    """
+    simplex_table, basic_vars, simplex_history, basic_vars_history = _simplex_solve(
+        num_vars,
+        constraints,
+        objective_function,
+        record_history
+    )
+    optimum = get_fraction(simplex_table[0][0, -1], simplex_table[1][0])
+    optimal_plane = create_solution(simplex_table, basic_vars, num_vars)
+    return optimum, optimal_plane, simplex_history, basic_vars_history
+
+
+def _simplex_solve(num_vars: int, constraints: list, objective_function: tuple, record_history: bool):
+    """
+    Runs the simplex method and returns the final simplex table instead of the optimal plan
+    :return:
+    simplex_table (tuple): final simplex table
+    basic_vars (list): final basic variables
     simplex_history (list): list containing the steps of simplex table conversion
     basic_vars_history (list): list containing the steps of basic_vars conversion
     """
+    simplex_table, basic_vars = _feasible_table(num_vars, constraints)
+    return _optimize(simplex_table, basic_vars, objective_function, record_history)
+
+
+def _feasible_table(num_vars: int, constraints: list):
+    """
+    Builds the simplex table of the first feasible plan: runs the first phase and cuts off the r variables.
+    The result does not depend on the objective function and can be shared by several of them
+    :return:
+    simplex_table (tuple): simplex table without the r variables
+    basic_vars (list): basic variables of the feasible plan
+    """
     simplex_table, r_rows, num_s_vars, num_r_vars = construct_simplex_table(constraints, num_vars)
-    objective, objective_function = objective_function[0], objective_function[1]
-    basic_vars = [0 for _ in range(len(simplex_table))]
-    simplex_table, basic_vars, simplex_history = phase1(simplex_table, basic_vars, r_rows, num_vars, num_s_vars)
-    r_index = num_r_vars + num_s_vars
-    for i in basic_vars:
-        if i > r_index:
-            raise ValueError("Infeasible solution")
+    simplex_table = exact_table(simplex_table)
+    basic_vars = [0 for _ in range(len(simplex_table[0]))]
+    simplex_table, basic_vars = phase1(simplex_table, basic_vars, r_rows, num_vars, num_s_vars)
+    # the sum of the r variables left after the first phase is positive only if there is no feasible plan
+    if simplex_table[0][0, -1] != 0:
+        raise ValueError("Infeasible solution")
+    simplex_table, basic_vars = drive_out_r_vars(simplex_table, basic_vars, num_vars + num_s_vars)
     simplex_table = delete_r_vars(simplex_table, num_vars, num_s_vars)
-    simplex_table = update_objective_function(simplex_table, objective_function, objective)
+    return simplex_table, basic_vars
+
+
+def _optimize(simplex_table: tuple, basic_vars: list, objective_function: tuple, record_history: bool):
+    """
+    Runs the second phase of the simplex method from a feasible plan, the simplex table is changed in place
+    :return:
+    simplex_table (tuple): final simplex table
+    basic_vars (list): final basic variables
+    simplex_history (list): list containing the steps of simplex table conversion
+    basic_vars_history (list): list containing the steps of basic_vars conversion
+    """
+    objective, objective_function = objective_function[0], objective_function[1]
+    simplex_table = exact_table(update_objective_function(simplex_table, objective_function, objective))
 
     simplex_history = {}
     basic_vars_history = {}
     for row, column in enumerate(basic_vars[1:]):
-        if simplex_table[0][column] != 0:
-            const = -simplex_table[0][column]
-            result = multiply_const_row(const, simplex_table[row])
-            simplex_table[0] = sum_rows(simplex_table[0], result)
-    simplex_history['Initial Simplex-method'] = copy.deepcopy(simplex_table)
-    basic_vars_history['Initial Simplex-method'] = copy.deepcopy(basic_vars)
+        num, den = simplex_table
+        if num[0, column] != 0:
+            const = -get_fraction(num[0, column], den[0])
+            simplex_table = axpy(simplex_table, 0, row + 1, const)
+    if record_history:
+        simplex_history['Initial Simplex-method'] = snapshot(simplex_table)
+        basic_vars_history['Initial Simplex-method'] = basic_vars[:]
     step = 1
     while not check_condition(simplex_table):
         key_column = find_key_column(simplex_table)
         key_row = find_key_row(simplex_table, key_column)
         simplex_table, basic_vars = simplex_step(simplex_table, basic_vars, key_column, key_row)
-        simplex_history[f'Simplex-method step {step}'] = copy.deepcopy(simplex_table)
-        basic_vars_history[f'Simplex-method step {step}'] = copy.deepcopy(basic_vars)
+        if record_history:
+            simplex_history[f'Simplex-method step {step}'] = snapshot(simplex_table)
+            basic_vars_history[f'Simplex-method step {step}'] = basic_vars[:]
         step += 1
-    optimum = simplex_table[0][-1]
-    optimal_plane = create_solution(simplex_table, basic_vars, num_vars)
-    return optimum, optimal_plane, simplex_history, basic_vars_history
+    return simplex_table, basic_vars, simplex_history, basic_vars_history
 
 
-def check_condition(simplex_table: list):
+def check_condition(simplex_table: tuple):
     """
     Checks the optimality condition of the objective function for the current simplex table
-     (all values in the row of the objective function are negative or equal to zero)
+     (all values in the row of the objective function, except for b, are negative or equal to zero)
     :param simplex_table: current simplex table
     :return: condition (bool): True if the optimality condition is met, False otherwise
     """
-    F = simplex_table[0]
-    negative_values = list(filter(lambda x: x <= 0, F))
-    condition = len(negative_values) == len(F)
+    num, den = simplex_table
+    if _compiled(num):
+        return _simplex_numba.check_condition(num)
+    condition = bool(np.all(num[0, :-1] <= 0))
     return condition
 
 
-def find_key_column(simplex_table: list):
+def find_key_column(simplex_table: tuple):
     """
     Find the resolving column in the current simplex table
+    (the column with the maximal positive value in the row of the objective function)
     :param simplex_table: current simplex table
     :return: key_column (int):  index of the resolving column
     """
-    key_columns = 0
-    for i in range(0, len(simplex_table[0]) - 1):
-        if abs(simplex_table[0][i]) >= abs(simplex_table[0][key_columns]):
-            key_columns = i
+    num, den = simplex_table
+    if _compiled(num):
+        return _simplex_numba.find_key_column(num)
+    # the row shares a single positive denominator, so the numerators can be compared directly
+    F = num[0, :-1]
+    # the last of the maximal elements is taken as the resolving one
+    key_columns = len(F) - 1 - int(np.argmax(F[::-1]))
 
     return key_columns
 
 
-def find_key_row(simplex_table: list, key_column: int):
+def find_key_row(simplex_table: tuple, key_column: int):
     """
     Search for a permissive row in the permissive column of the current simplex table.
     :param simplex_table: current simplex table
     :param key_column: index of the resolving column
     :return: key_row (int): index of the resolving row
     """
-    min_val = float("inf")
-    key_row = 0
-    for i in range(1, len(simplex_table)):
-        if simplex_table[i][key_column] > 0:
-            val = simplex_table[i][-1] / simplex_table[i][key_column]
-            if val < min_val:
-                min_val = val
-                key_row = i
-    if min_val == float("inf"):
+    num, den = simplex_table
+    if _compiled(num):
+        key_row = _simplex_numba.find_key_row(num, key_column)
+    else:
+        # b and the resolving column of a row share the row denominator, which cancels out in the ratio,
+        # the ratios are compared exactly and the first of the minimal ones is taken as by the compiled kernel
+        rows = np.flatnonzero(num[1:, key_column] > 0) + 1
+        if len(rows) == 0:
+            key_row = 0
+        elif num.dtype == object:
+            key_row = min(rows.tolist(), key=lambda i: exact_fraction(num[i, -1], num[i, key_column]))
+        else:
+            key_row = int(rows[argmin_ratio(num[rows, -1], num[rows, key_column])])
+    if key_row == 0:
         raise ValueError("Unbounded solution")
-    if min_val == 0:
+    if num[key_row, -1] == 0:
         warn("Dengeneracy")
     return key_row
 
 
-def simplex_step(simplex_table: list, basic_vars: list, key_column: int, key_row: int):
+def simplex_step(simplex_table: tuple, basic_vars: list, key_column: int, key_row: int):
     """
     Performs one step of the simplex algorithm:
         - input of new basic variables and output of old variables from the basis,
@@ -116,30 +175,49 @@ def simplex_step(simplex_table: list, basic_vars: list, key_column: int, key_row
     :param key_column: index of the permissive column
     :param key_row: index of the permissive row
     :return:
-    simplex_table (list): new simplex table
+    simplex_table (tuple): new simplex table
     basic_vars (list): new basic variables
     """
     basic_vars[key_row] = key_column
-    pivot = simplex_table[key_row][key_column]
-    simplex_table = normalize_to_pivot(simplex_table, key_row, pivot)
+    if _compiled(simplex_table[0]):
+        magnitude = _simplex_numba.pivot(simplex_table[0], simplex_table[1], key_row, key_column)
+        if magnitude > INT64_BOUND:
+            simplex_table = to_python_ints(simplex_table)
+        return simplex_table, basic_vars
+    simplex_table = normalize_to_pivot(simplex_table, key_row, simplex_table[0][key_row, key_column])
     simplex_table = make_key_column_zero(simplex_table, key_column, key_row)
-    return simplex_table, basic_vars
+    return exact_table(simplex_table), basic_vars
 
 
-def normalize_to_pivot(simplex_table: list, key_row: int, pivot: int):
+def _compiled(num):
     """
-    Divides the resolving row of the current simplex table by the resolving element
+    Checks whether the compiled kernels can process the simplex table:
+    numba is installed and the table has not been converted to Python ints (see table_tools.exact_table)
+    :param num: numerators of the simplex table
+    :return: condition (bool): True if the kernels of _simplex_numba are used
+    """
+    return _simplex_numba.NUMBA_AVAILABLE and num.dtype == np.int64
+
+
+def normalize_to_pivot(simplex_table: tuple, key_row: int, pivot: int):
+    """
+    Divides the resolving row of the current simplex table by the resolving element.
+    The numerators of the row stay unchanged, only the row denominator is replaced
     :param simplex_table: current simplex table
     :param key_row: index of the permissive row
-    :param pivot: resolving element
+    :param pivot: numerator of the resolving element, num[key_row, key_column], over the row denominator
     :return:
     """
-    for i in range(len(simplex_table[0])):
-        simplex_table[key_row][i] /= pivot
+    num, den = simplex_table
+    # the row denominator cancels out in the division, the sign of the resolving element is moved to the numerators
+    if pivot < 0:
+        num[key_row] = -num[key_row]
+    den[key_row] = abs(pivot)
+    num[key_row], den[key_row] = reduce_rows(num[key_row], den[key_row])
     return simplex_table
 
 
-def make_key_column_zero(simplex_table: list, key_column: int, key_row: int):
+def make_key_column_zero(simplex_table: tuple, key_column: int, key_row: int):
     """
     Zeroes the elements of the resolving column of the current simplex table
     with the exception of the element standing in the resolving row by the Jordano-Gauss method
@@ -147,45 +225,73 @@ def make_key_column_zero(simplex_table: list, key_column: int, key_row: int):
     :param key_column: index of the permissive column
     :param key_row: index of the permissive row
     :return:
-    simplex_table (list): new simplex table
-    """
-    num_columns = len(simplex_table[0])
-    for i in range(len(simplex_table)):
-        if i != key_row:
-            factor = simplex_table[i][key_column]
-            for j in range(num_columns):
-                simplex_table[i][j] -= simplex_table[key_row][j] * factor
-    return simplex_table
+    simplex_table (tuple): new simplex table
+    """
+    num, den = simplex_table
+    factor = num[:, key_column, np.newaxis]
+    new_num = num * den[key_row] - factor * num[key_row]
+    new_den = den * den[key_row]
+    new_num, new_den = reduce_rows(new_num, new_den)
+    # the table is updated in place, it may be a view of the buffers with spare rows and columns
+    is_key_row = np.arange(len(num)) == key_row
+    num[...] = np.where(is_key_row[:, np.newaxis], num, new_num)
+    den[...] = np.where(is_key_row, den, new_den)
+    return num, den
 
 
-def delete_r_vars(simplex_table: list, num_vars: int, num_s_vars: int):
-    for i in range(len(simplex_table)):
-        non_r_length = num_vars + num_s_vars + 1
-        length = len(simplex_table[i])
-        while length != non_r_length:
-            del simplex_table[i][non_r_length-1]
-            length -= 1
-    return simplex_table
+def drive_out_r_vars(simplex_table: tuple, basic_vars: list, r_index: int):
+    """
+    Removes the r variables left in the basis at zero level after the first phase.
+    Each of them is replaced by the first variable of its row with a non-zero coefficient that is not an r variable,
+    the b of the row is zero, so the step keeps the plan feasible. A row without such a variable is a linear
+    combination of the other constraints and is deleted
+    :param simplex_table: simplex table after the first phase
+    :param basic_vars: basic variables after the first phase
+    :param r_index: index of the first r variable
+    :return:
+    simplex_table (tuple): simplex table without the r variables in the basis
+    basic_vars (list): new basic variables
+    """
+    redundant_rows = []
+    for i in range(1, len(basic_vars)):
+        if basic_vars[i] >= r_index:
+            columns = np.flatnonzero(simplex_table[0][i, :r_index])
+            if len(columns) == 0:
+                redundant_rows.append(i)
+                continue
+            simplex_table, basic_vars = simplex_step(simplex_table, basic_vars, int(columns[0]), i)
+    if redundant_rows:
+        num, den = simplex_table
+        simplex_table = np.delete(num, redundant_rows, axis=0), np.delete(den, redundant_rows)
+        basic_vars = [var for i, var in enumerate(basic_vars) if i not in redundant_rows]
+    return simplex_table, basic_vars
 
 
-def phase1(simplex_table: list, basic_vars: list, r_rows: list, num_vars: int, num_s_vars: int):
+def delete_r_vars(simplex_table: tuple, num_vars: int, num_s_vars: int):
+    num, den = simplex_table
+    non_r_length = num_vars + num_s_vars + 1
+    # the b column is moved in place of the first r variable, the rest of the r columns are cut off by a view
+    num[:, non_r_length - 1] = num[:, -1]
+    return num[:, :non_r_length], den
+
+
+def phase1(simplex_table: tuple, basic_vars: list, r_rows: list, num_vars: int, num_s_vars: int):
     # Objective function here is minimize r1+ r2 + r3 + ... + rn
-    simplex_history = []
+    num, den = simplex_table
     r_index = num_vars + num_s_vars
-    for i in range(r_index, len(simplex_table[0]) - 1):
-        simplex_table[0][i] = -1
+    num[0, r_index:-1] = -den[0]
     for i in r_rows:
-        simplex_table[0] = sum_rows(simplex_table[0], simplex_table[i])
+        simplex_table = axpy(simplex_table, 0, i, 1)
         basic_vars[i] = r_index
         r_index += 1
+    num, den = simplex_table
     s_index = num_vars
     for i in range(1, len(basic_vars)):
         if basic_vars[i] == 0:
-            basic_vars[i] = s_index
-            s_index += 1
+            # rows without an r variable have a slack variable with the coefficient 1 in the basis
+            basic_vars[i] = s_index + int(np.argmax(num[i, s_index:s_index + num_s_vars] > 0))
     while not check_condition(simplex_table):
-        key_column = find_key_column()
-        key_row = find_key_row(key_column=key_column)
-        simplex_table, basic_vars = simplex_step(key_column, key_row)
-        simplex_history.append(copy.deepcopy(simplex_table))
-    return simplex_table, basic_vars, simplex_history
\ No newline at end of file
+        key_column = find_key_column(simplex_table)
+        key_row = find_key_row(simplex_table, key_column)
+        simplex_table, basic_vars = simplex_step(simplex_table, basic_vars, key_column, key_row)
+    return simplex_table, basic_vars
\ No newline at end of file
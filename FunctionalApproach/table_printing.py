@@ -1,4 +1,21 @@
-import pandas as pd
+from FunctionalApproach.utils import to_fractions
+
+
+def format_table(table, columns, index):
+    """
+    Formats the simplex table as text with right-aligned columns
+    :param table: simplex table (list of lists)
+    :param columns: column labels
+    :param index: row labels
+    :return: text (str): formatted table
+    """
+    rows = [[''] + columns] + [[label] + [str(x) for x in row] for label, row in zip(index, table)]
+    widths = [max(len(row[j]) for row in rows) for j in range(len(rows[0]))]
+    lines = []
+    for row in rows:
+        cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        lines.append('  '.join(cells))
+    return '\n'.join(lines)
 
 
 def print_history_table(table_history, basic_vars_history, solution):
@@ -11,14 +28,12 @@ def print_history_table(table_history, basic_vars_history, solution):
     """
     for step, table in table_history.items():
         print(step)
-        simplex_table = pd.DataFrame(
-            table,
-            columns=[f'x{i + 1}' if i < len(table[0]) - 1 else 'b' for i in range(len(table[0]))],
-            index=[f'x{basic_vars_history[step][i] + 1}' if i != 0 else 'f(x)' for i in
-                   range(len(basic_vars_history[step]))]
-        )
-        print(simplex_table)
+        table = to_fractions(table)
+        columns = [f'x{i + 1}' if i < len(table[0]) - 1 else 'b' for i in range(len(table[0]))]
+        index = [f'x{basic_vars_history[step][i] + 1}' if i != 0 else 'f(x)' for i in
+                 range(len(basic_vars_history[step]))]
+        print(format_table(table, columns, index))
         print()
     print('Optimal point:')
     for var, value in solution.items():
-        print(var, value)
\ No newline at end of file
+        print(var, value)
@@ -1,26 +1,173 @@
-def sum_rows(row1: list, row2: list):
+import numpy as np
+
+# The values of an int64 simplex table are kept within this bound: the pivot subtracts two products of such values,
+# which stays below 2 ** 63. A table with larger values is converted to Python ints, which cannot overflow
+INT64_BOUND = 2 ** 31 - 1
+
+
+def fits_int64(simplex_table: tuple):
+    """
+    Checks that all the values of the simplex table are within INT64_BOUND
+    :param simplex_table: current simplex table, pair of arrays (num, den)
+    :return: condition (bool): True if the table can be processed in int64 without overflow
+    """
+    num, den = simplex_table
+    return bool(-INT64_BOUND <= num.min() and num.max() <= INT64_BOUND and den.max() <= INT64_BOUND)
+
+
+def to_python_ints(simplex_table: tuple):
+    """
+    Converts the simplex table into arrays of Python ints
+    :param simplex_table: current simplex table, pair of arrays (num, den)
+    :return: simplex_table (tuple): new simplex table of object arrays
+    """
+    num, den = simplex_table
+    return num.astype(object), den.astype(object)
+
+
+def exact_table(simplex_table: tuple):
+    """
+    Returns the simplex table unchanged while it can be processed in int64, otherwise converts it to Python ints
+    :param simplex_table: current simplex table, pair of arrays (num, den)
+    :return: simplex_table (tuple): simplex table whose arithmetic cannot overflow
+    """
+    if simplex_table[0].dtype == object or fits_int64(simplex_table):
+        return simplex_table
+    return to_python_ints(simplex_table)
+
+
+def argmin_ratio(num, den, last: bool = False):
+    """
+    Finds the minimal of the ratios num / den exactly, without building fractions.
+    The candidate found in floating point is compared with all the ratios by cross-multiplication
+    and is replaced while there is a smaller one, the products of values within INT64_BOUND do not overflow int64
+    :param num: numerators of the ratios, int64 or Python ints
+    :param den: positive denominators of the ratios, int64 or Python ints
+    :param last: if True, the last of the minimal ratios is taken, otherwise the first one
+    :return: index (int): index of the minimal ratio
+    """
+    index = int(np.argmin(num / den))
+    while True:
+        # the denominators are positive, so diff has the sign of num / den - num[index] / den[index]
+        diff = num * den[index] - num[index] * den
+        smaller = int(np.argmin(diff))
+        if diff[smaller] >= 0:
+            break
+        index = smaller
+    ties = diff == 0
+    return len(ties) - 1 - int(np.argmax(ties[::-1])) if last else int(np.argmax(ties))
+
+
+def reduce_rows(num, den):
+    """
+    Reduces the rows of the simplex table by the greatest common divisor of their numerators and denominator.
+    Every row i stores the values num[i, :] / den[i] with a single positive denominator.
+    :param num: numerators, a row of shape (cols,) or a table of shape (rows, cols)
+    :param den: positive denominator of the row or array of denominators of shape (rows,)
+    :return:
+    num (ndarray): reduced numerators
+    den (ndarray): reduced denominators
+    """
+    # the reduced axis is kept, so that the divisor stays an array of the dtype of the table for a single row as well
+    gcd = np.gcd(np.gcd.reduce(num, axis=-1, keepdims=True), np.asarray(den, dtype=num.dtype)[..., np.newaxis])
+    return num // gcd, den // gcd[..., 0]
+
+
+def snapshot(simplex_table: tuple):
+    """
+    Copies the simplex table for recording it in the history of the method
+    :param simplex_table: current simplex table, pair of arrays (num, den)
+    :return: simplex_table (tuple): independent copy of the simplex table
+    """
+    num, den = simplex_table
+    return num.copy(), den.copy()
+
+
+def sum_rows(row1: tuple, row2: tuple):
     """
     Summarizes two rows of the current simplex table. The lines are set in the parameters
-    :param row1: the first line is the summand
-    :param row2: the second line is the summand
-    :return: sum_rows (list): result summarizes
+    :param row1: the first line is the summand, pair (num, den) of the numerators array and the row denominator
+    :param row2: the second line is the summand, pair (num, den) of the numerators array and the row denominator
+    :return: sum_rows (tuple): result summarizes, pair (num, den)
     """
-    row_sum = [0 for i in range(len(row1))]
-    for i in range(len(row1)):
-        row_sum[i] = row1[i] + row2[i]
-    return row_sum
+    num1, den1 = row1
+    num2, den2 = row2
+    return reduce_rows(num1 * den2 + num2 * den1, den1 * den2)
 
 
-def multiply_const_row(const: float, row: list):
+def multiply_const_row(const, row: tuple):
     """
     Multiplies the row by a constant.
     The constant and index of the multiplied string are specified in the parameters
-    :param const: the constant by which the string is multiplied
-    :param row: row to be multiplied by a constant
-    :return: mul_row (list): the result of multiplying a string by a constant
+    :param const: the constant by which the string is multiplied (Fraction or int)
+    :param row: row to be multiplied by a constant, pair (num, den) of the numerators array and the row denominator
+    :return: mul_row (tuple): the result of multiplying a string by a constant, pair (num, den) of Python ints,
+     the constant is not bounded, so its product may not fit int64
     """
-    mul_row = []
-    for i in row:
-        mul_row.append(const*i)
-    return mul_row
+    num, den = row
+    return reduce_rows(num.astype(object) * int(const.numerator), int(den) * int(const.denominator))
 
+
+def axpy(simplex_table: tuple, dst: int, src: int, const):
+    """
+    Adds the row multiplied by a constant to the destination row of the simplex table in place (dst += const * src)
+    :param simplex_table: current simplex table, pair of arrays (num, den)
+    :param dst: index of the row to which the product is added
+    :param src: index of the row to be multiplied by a constant
+    :param const: the constant by which the row is multiplied (Fraction or int)
+    :return: simplex_table (tuple): the same simplex table, or its copy in Python ints if the new row does not fit int64
+    """
+    num, den = simplex_table
+    const_num, const_den = int(const.numerator), int(const.denominator)
+    dst_scale, src_scale = int(den[src]) * const_den, int(den[dst]) * const_num
+    row_den = int(den[dst]) * dst_scale
+    dst_num, src_num = num[dst], num[src]
+    # the row is computed in int64 if the bound of its values, taken in Python ints, leaves a margin below 2 ** 63,
+    # otherwise the products of three values are computed in Python ints
+    magnitude = int(np.abs(dst_num).max()) * dst_scale + int(np.abs(src_num).max()) * abs(src_scale)
+    if num.dtype == object or max(magnitude, row_den) >= 2 ** 62:
+        dst_num, src_num = dst_num.astype(object), src_num.astype(object)
+    row_num, row_den = reduce_rows(dst_num * dst_scale + src_num * src_scale, row_den)
+    if num.dtype != object and not fits_int64((row_num, np.asarray([row_den]))):
+        simplex_table = num, den = to_python_ints(simplex_table)
+    num[dst], den[dst] = row_num, row_den
+    return simplex_table
+
+
+def allocate_table(simplex_table: tuple, extra_rows: int):
+    """
+    Copies the simplex table into zero-filled buffers with spare rows and columns,
+    so that the Gomory clippings can be added without copying the whole table every time
+    :param simplex_table: current simplex table, pair of arrays (num, den)
+    :param extra_rows: number of spare rows (the same number of spare columns is reserved for the new variables)
+    :return:
+    buffer (tuple): pair of buffer arrays (num, den)
+    simplex_table (tuple): the simplex table as a view of the buffers
+    """
+    num, den = simplex_table
+    num_rows, num_columns = num.shape
+    buffer_num = np.zeros((num_rows + extra_rows, num_columns + extra_rows), dtype=num.dtype)
+    buffer_den = np.ones(num_rows + extra_rows, dtype=den.dtype)
+    buffer_num[:num_rows, :num_columns] = num
+    buffer_den[:num_rows] = den
+    return (buffer_num, buffer_den), (buffer_num[:num_rows, :num_columns], buffer_den[:num_rows])
+
+
+def add_row_and_column(buffer: tuple, simplex_table: tuple):
+    """
+    Adds a zero row to the end of the simplex table and a zero column in front of the b column.
+    Only the b column is moved, the buffers are reallocated with doubled capacity when the spare rows run out
+    and when the table has been converted to Python ints (see exact_table)
+    :param buffer: pair of buffer arrays (num, den) holding the simplex table
+    :param simplex_table: current simplex table, a view of the buffers
+    :return:
+    buffer (tuple): pair of buffer arrays (num, den)
+    simplex_table (tuple): new simplex table, a view of the buffers
+    """
+    num_rows, num_columns = simplex_table[0].shape
+    if num_rows == len(buffer[1]) or num_columns == buffer[0].shape[1] or buffer[0].dtype != simplex_table[0].dtype:
+        buffer, simplex_table = allocate_table(simplex_table, max(num_rows, 1))
+    buffer_num, buffer_den = buffer
+    buffer_num[:num_rows, num_columns] = buffer_num[:num_rows, num_columns - 1]
+    buffer_num[:num_rows, num_columns - 1] = 0
+    return buffer, (buffer_num[:num_rows + 1, :num_columns + 1], buffer_den[:num_rows + 1])
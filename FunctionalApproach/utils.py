@@ -1,84 +1,127 @@
+import re
 from fractions import Fraction
+try:
+    from gmpy2 import mpq
+except ImportError:  # gmpy2 is optional, the internal exact comparisons fall back to the standard library fractions
+    mpq = Fraction
+import numpy as np
+
+
+_TERM_RE = re.compile(r'([+-]?)\s*(\d*)\s*x_(\d+)')
+_RELATION_RE = re.compile(r'(<=|>=|=)')
+
+
+def parse_expression(expression):
+    """
+    Parses a linear expression (for example, '2x_1 - 4x_3 + x_2') into its terms
+    :param expression: linear expression
+    :return: terms (list): list of (index, coeff) pairs, where index is the zero-based index of the variable
+    """
+    return [(int(index) - 1, -int(coeff or 1) if sign == '-' else int(coeff or 1))
+            for sign, coeff, index in _TERM_RE.findall(expression)]
+
+
+def parse_constraint(constraint):
+    """
+    Splits a constraint (for example, '1x_1 + 2x_2 >= 4') into the terms of the left side, relation and right side
+    :param constraint: constraint
+    :return:
+    terms (list): list of (index, coeff) pairs of the left side
+    relation (str): '<=', '>=' or '='
+    rhs (str): right side of the constraint
+    """
+    lhs, relation, rhs = _RELATION_RE.split(constraint, maxsplit=1)
+    return parse_expression(lhs), relation, rhs.strip()
 
 
 def construct_simplex_table(constraints, num_vars):
     """
     Builds an initial simplex table from the specified constraints and the objective function.
+    The table is returned as an int64 array of numerators and an int64 array of row denominators.
     :param constraints:
     :param num_vars:
     :return:
     """
+    parsed_constraints = [parse_constraint(constraint) for constraint in constraints]
     num_s_vars = 0  # number of slack and surplus variables
     num_r_vars = 0  # number of additional variables to balance equality and less than equal to
-    for expression in constraints:
-        if '>=' in expression:
-            num_s_vars += 1
-        elif '<=' in expression:
+    for _, relation, _ in parsed_constraints:
+        if relation == '>=':
             num_s_vars += 1
             num_r_vars += 1
-        elif '=' in expression:
+        elif relation == '<=':
+            num_s_vars += 1
+        elif relation == '=':
             num_r_vars += 1
     total_vars = num_vars + num_s_vars + num_r_vars
 
-    coeff_matrix = [[Fraction("0/1") for _ in range(total_vars + 1)] for _ in range(len(constraints) + 1)]
+    # all coefficients are integers, so every row starts with the denominator 1
+    num = np.zeros((len(constraints) + 1, total_vars + 1), dtype=np.int64)
+    den = np.ones(len(constraints) + 1, dtype=np.int64)
     s_index = num_vars
     r_index = num_vars + num_s_vars
     r_rows = []  # stores the non -zero index of r
-    for i in range(1, len(constraints) + 1):
-        constraint = constraints[i - 1].split(' ')
-
-        for j in range(len(constraint)):
+    for i, (terms, relation, rhs) in enumerate(parsed_constraints, start=1):
+        for index, coeff in terms:
+            num[i, index] = coeff
 
-            if '_' in constraint[j]:
-                coeff, index = constraint[j].split('_')
-                if constraint[j - 1] == '-':
-                    coeff_matrix[i][int(index) - 1] = Fraction("-" + coeff[:-1] + "/1")
-                else:
-                    coeff_matrix[i][int(index) - 1] = Fraction(coeff[:-1] + "/1")
+        if relation == '<=':
+            num[i, s_index] = 1  # add surplus variable
+            s_index += 1
 
-            elif constraint[j] == '<=':
-                coeff_matrix[i][s_index] = Fraction("1/1")  # add surplus variable
-                s_index += 1
+        elif relation == '>=':
+            num[i, s_index] = -1  # slack variable
+            num[i, r_index] = 1  # r variable
+            s_index += 1
+            r_index += 1
+            r_rows.append(i)
 
-            elif constraint[j] == '>=':
-                coeff_matrix[i][s_index] = Fraction("-1/1")  # slack variable
-                coeff_matrix[i][r_index] = Fraction("1/1")  # r variable
-                s_index += 1
-                r_index += 1
-                r_rows.append(i)
+        elif relation == '=':
+            num[i, r_index] = 1  # r variable
+            r_index += 1
+            r_rows.append(i)
 
-            elif constraint[j] == '=':
-                coeff_matrix[i][r_index] = Fraction("1/1")  # r variable
-                r_index += 1
-                r_rows.append(i)
-
-            coeff_matrix[i][-1] = Fraction(constraint[-1] + "/1")
-    return coeff_matrix, r_rows, num_s_vars, num_r_vars
+        num[i, -1] = int(rhs)
+    return (num, den), r_rows, num_s_vars, num_r_vars
 
 
 def update_objective_function(simplex_table, objective_function, objective):
-    objective_function_coeffs = objective_function.split()
-    for i in range(len(objective_function_coeffs)):
-        if '_' in objective_function_coeffs[i]:
-            coeff, index = objective_function_coeffs[i].split('_')
-            if objective_function_coeffs[i-1] == '-':
-                simplex_table[0][int(index)-1] = Fraction(int(coeff[:-1]), 1)
-            else:
-                simplex_table[0][int(index)-1] = Fraction(-int(coeff[:-1]), 1)
-            if 'max' in objective:
-                simplex_table[0][int(index)-1] *= -1
+    num, den = simplex_table
+    # the row of the first phase objective function is replaced entirely
+    num[0] = 0
+    den[0] = 1
+    for index, coeff in parse_expression(objective_function):
+        num[0, index] = (coeff if 'max' in objective else -coeff) * den[0]
     return simplex_table
 
 
 def create_solution(simplex_table, basic_vars, num_vars):
+    num, den = simplex_table
     solution = {}
     for i, var in enumerate(basic_vars[1:]):
         if var < num_vars:
-            solution['x_' + str(var + 1)] = simplex_table[i + 1][-1]
+            solution['x_' + str(var + 1)] = get_fraction(num[i + 1, -1], den[i + 1])
     for i in range(0, num_vars):
         if i not in basic_vars[1:]:
             solution['x_' + str(i + 1)] = 0
     return solution
 
+
+def to_fractions(simplex_table):
+    """
+    Converts a simplex table given as a pair of numerator and row denominator arrays into a list of lists of fractions
+    :param simplex_table: (num, den) arrays of shape (rows, cols) and (rows,)
+    :return: table (list): list of lists of Fraction
+    """
+    num, den = simplex_table
+    return [[get_fraction(n, d) for n in num_row] for num_row, d in zip(num, den)]
+
+
 def get_fraction(numerator, denominator):
-    return Fraction(numerator, denominator)
\ No newline at end of file
+    # the values returned to the caller are always fractions.Fraction, whatever backend is installed
+    return Fraction(int(numerator), int(denominator))
+
+
+def exact_fraction(numerator, denominator):
+    # internal exact comparisons use gmpy2.mpq when it is installed
+    return mpq(int(numerator), int(denominator))
@@ -0,0 +1,190 @@
+import numpy as np
+
+try:
+    from numba import njit, prange, get_num_threads
+    # Workaround: numba starts its threading layer only when it compiles a parallel function. pivot and run_simplex
+    # call _eliminate_rows_parallel, and when they are loaded from the on-disk cache (cache=True) nothing is
+    # compiled, so the first parallel loop runs without a threading layer and the process crashes.
+    # get_num_threads() starts the layer; it is called once on import, before any cached kernel can be loaded,
+    # it runs no threads and has no other effect
+    get_num_threads()
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, SimplexMethod falls back to the NumPy implementation
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+# status codes returned by run_simplex
+OPTIMAL = 0
+UNBOUNDED = 1
+OVERFLOW = 2
+
+# the kernels process tables with the values within this bound: a step subtracts two products of such values,
+# which stays below 2 ** 63. A table with larger values is converted to Python ints, which cannot overflow
+INT64_BOUND = 2 ** 31 - 1
+
+# the rows are eliminated in parallel only for tables with at least this number of elements,
+# for smaller tables starting the threads costs more than the elimination itself
+PARALLEL_THRESHOLD = 1 << 16
+
+
+@njit(cache=True)
+def _gcd(a, b):
+    a, b = abs(a), abs(b)
+    while b != 0:
+        a, b = b, a % b
+    return a
+
+
+@njit(cache=True)
+def _reduce_row(num, den, i):
+    g = den[i]
+    for j in range(num.shape[1]):
+        if g == 1:
+            return
+        g = _gcd(g, num[i, j])
+    for j in range(num.shape[1]):
+        num[i, j] //= g
+    den[i] //= g
+
+
+@njit(cache=True)
+def _check_condition(num):
+    for j in range(num.shape[1] - 1):
+        if num[0, j] > 0:
+            return False
+    return True
+
+
+@njit(cache=True)
+def _find_key_column(num, den, steepest_edge):
+    # only the columns with a positive value in the row of the objective function are candidates,
+    # the last of the best ones is taken as with the NumPy implementation
+    key_column = 0
+    best_score = -1.0
+    for j in range(num.shape[1] - 1):
+        if num[0, j] <= 0:
+            continue
+        score = float(num[0, j])
+        if steepest_edge:
+            gamma = 1.0
+            for i in range(1, num.shape[0]):
+                a = num[i, j] / den[i]
+                gamma += a * a
+            score = score * score / gamma
+        if score >= best_score:
+            key_column = j
+            best_score = score
+    return key_column
+
+
+@njit(cache=True)
+def _find_key_row(num, key_column):
+    # b and the resolving column share the row denominator, the ratios are compared by cross-multiplication
+    key_row = 0
+    min_num, min_den = 0, 1
+    for i in range(1, num.shape[0]):
+        if num[i, key_column] > 0:
+            if key_row == 0 or num[i, -1] * min_den < min_num * num[i, key_column]:
+                key_row = i
+                min_num, min_den = num[i, -1], num[i, key_column]
+    return key_row
+
+
+@njit(cache=True)
+def pivot(num, den, key_row, key_column):
+    """
+    Performs the Jordan-Gauss elimination in place:
+    divides the resolving row by the resolving element and zeroes the other elements of the resolving column.
+    Every row i stores the values num[i, :] / den[i], so the division only replaces the row denominator.
+    The values of the table must be within INT64_BOUND, then the products do not overflow
+    :param num: numerators of the simplex table
+    :param den: row denominators of the simplex table
+    :param key_row: index of the permissive row
+    :param key_column: index of the permissive column
+    :return: magnitude (int): the largest absolute value of the changed rows,
+     the table has to be converted to Python ints before the next step if it exceeds INT64_BOUND
+    """
+    num_rows, num_columns = num.shape
+    pivot_num = num[key_row, key_column]
+    if pivot_num < 0:
+        for j in range(num_columns):
+            num[key_row, j] = -num[key_row, j]
+        pivot_num = -pivot_num
+    den[key_row] = pivot_num
+    _reduce_row(num, den, key_row)
+    # indexes of the non-zero elements of the resolving row, the other columns of a row are only scaled
+    columns = np.empty(num_columns, dtype=np.int64)
+    num_nonzero = 0
+    for j in range(num_columns):
+        if num[key_row, j] != 0:
+            columns[num_nonzero] = j
+            num_nonzero += 1
+    magnitude = den[key_row]
+    if num_rows * num_columns >= PARALLEL_THRESHOLD:
+        magnitude = max(magnitude, _eliminate_rows_parallel(num, den, key_row, key_column, columns[:num_nonzero]))
+    else:
+        for i in range(num_rows):
+            magnitude = max(magnitude, _eliminate_row(num, den, i, key_row, key_column, columns[:num_nonzero]))
+    return magnitude
+
+
+@njit(cache=True)
+def _eliminate_row(num, den, i, key_row, key_column, columns):
+    # returns the largest absolute value of the changed row, 0 if the row is left unchanged
+    factor = num[i, key_column]
+    if i == key_row or factor == 0:
+        return 0
+    if den[key_row] != 1:
+        for j in range(num.shape[1]):
+            num[i, j] *= den[key_row]
+    for j in columns:
+        num[i, j] -= factor * num[key_row, j]
+    den[i] *= den[key_row]
+    _reduce_row(num, den, i)
+    magnitude = den[i]
+    for j in range(num.shape[1]):
+        magnitude = max(magnitude, abs(num[i, j]))
+    return magnitude
+
+
+@njit(parallel=True, cache=True)
+def _eliminate_rows_parallel(num, den, key_row, key_column, columns):
+    # every row is updated only from itself and the resolving row, so the rows are independent
+    magnitudes = np.zeros(num.shape[0], dtype=np.int64)
+    for i in prange(num.shape[0]):
+        magnitudes[i] = _eliminate_row(num, den, i, key_row, key_column, columns)
+    return magnitudes.max()
+
+
+@njit(cache=True)
+def run_simplex(num, den, basic_vars, steepest_edge):
+    """
+    Performs the steps of the simplex method until the optimality condition of the objective function is met.
+    The simplex table and the basic variables are changed in place
+    :param num: numerators of the simplex table
+    :param den: row denominators of the simplex table
+    :param basic_vars: basic variables
+    :param steepest_edge: if True, the resolving column is chosen by the steepest edge rule instead of the Dantzig rule
+    :return:
+    status (int): OPTIMAL, UNBOUNDED or OVERFLOW, if the values of the table have exceeded INT64_BOUND
+     and the table has to be converted to Python ints before the next step
+    degenerate (bool): True if a degenerate step has been made
+    """
+    degenerate = False
+    while not _check_condition(num):
+        key_column = _find_key_column(num, den, steepest_edge)
+        key_row = _find_key_row(num, key_column)
+        if key_row == 0:
+            return UNBOUNDED, degenerate
+        if num[key_row, -1] == 0:
+            degenerate = True
+        basic_vars[key_row] = key_column
+        if pivot(num, den, key_row, key_column) > INT64_BOUND:
+            return OVERFLOW, degenerate
+    return OPTIMAL, degenerate
@@ -1,10 +1,12 @@
+import numpy as np
 from simplex_method import SimplexMethod
-import copy
 
 
 class GomoryMethod(SimplexMethod):
+    __slots__ = ('clipping_history', 'simplex_vals', 'simplex_solution')
 
-    def __init__(self, num_vars: int, constraints: list, objective_function: tuple):
+    def __init__(self, num_vars: int, constraints: list, objective_function: tuple, record_history: bool = False,
+                 pricing: str = 'dantzig'):
         """
         The method calls the constructor of the SimplexMethod parent class and initializes the parameters of the simplex algorithm.
         In the method, the solution of the simplex method is formed for the given constraints and the objective function.
@@ -13,8 +15,10 @@ class GomoryMethod(SimplexMethod):
          (for example ['1x_1 + 2x_2 >= 4', '2x_3 + 3x_1 <= 5', 'x_3 + 3x_2 = 6'])
         :param objective_function: tuple in which two string values are specified: objective function
          (for example, '2x_1 + 4x_3 + 5x_2') optimization direction ('min' or 'max')
+        :param record_history: if True, the simplex table and basic variables are saved after each step
+        :param pricing: rule of choosing the resolving column of the simplex method ('dantzig' or 'steepest_edge')
         """
-        super().__init__(num_vars, constraints, objective_function)
+        super().__init__(num_vars, constraints, objective_function, record_history, pricing)
         self.clipping_history = []
         self.simplex_vals, self.simplex_solution = self.solve()
 
@@ -33,19 +37,21 @@ class GomoryMethod(SimplexMethod):
         integer_optimal_plane (list): the optimal integer plan obtained by the Gomory method
         """
         if self._check_integer_condition():
-            return self.simplex_table[0][-1], self.simplex_solution
-        self.simplex_history[f'Initial Gomory-method'] = copy.deepcopy(self.simplex_table.get_table())
-        self.basic_vars_history[f'Initial Gomory-method'] = copy.deepcopy(self.basic_vars)
+            return self.simplex_table.get_item(0, -1), self.simplex_solution
+        if self.record_history:
+            self.simplex_history[f'Initial Gomory-method'] = self.simplex_table.snapshot()
+            self.basic_vars_history[f'Initial Gomory-method'] = self.basic_vars.copy()
         step = 1
         while not self._check_integer_condition():
             self._add_clipping()
             key_row = self._get_key_row()
             key_column = self._get_key_column(key_row)
             self.simplex_step(key_column, key_row)
-            self.simplex_history[f'Gomory method step {step}'] = copy.deepcopy(self.simplex_table.get_table())
-            self.basic_vars_history[f'Gomory method step {step}'] = copy.deepcopy(self.basic_vars)
+            if self.record_history:
+                self.simplex_history[f'Gomory method step {step}'] = self.simplex_table.snapshot()
+                self.basic_vars_history[f'Gomory method step {step}'] = self.basic_vars.copy()
             step += 1
-        integer_optimum = self.simplex_table[0][-1]
+        integer_optimum = self.simplex_table.get_item(0, -1)
         integer_optimal_plane = self.get_solution()
         return integer_optimum, integer_optimal_plane
 
@@ -55,12 +61,8 @@ class GomoryMethod(SimplexMethod):
         (all values in the row of the objective function of the current simplex table are negative or equal to 0 and are integer)
         :return: condition (bool): True or False, depending on the fulfillment of the integer optimality condition
         """
-        B = [x[-1] for x in self.simplex_table[1:]]
-        integer_values = list(filter(lambda x: x.denominator == 1, B))
-        positive_values = list(filter(lambda x: x >= 0, B))
-        condition1 = len(positive_values) == len(B)
-        condition2 = len(integer_values) == len(B)
-        condition = condition1 and condition2
+        num, den = self.simplex_table.get_arrays()
+        condition = all(b % d == 0 and b >= 0 for b, d in zip(num[1:, -1], den[1:]))
         return condition
 
     def _find_max_fractional_index(self):
@@ -69,12 +71,17 @@ class GomoryMethod(SimplexMethod):
         maximum value of the fractional part of the element is located
         :return: max_fractional_index (int): index of the row containing the element with the maximum fractional part
         """
+        num, den = self.simplex_table.get_arrays()
+        b_num = np.abs(num[:, -1]).tolist()
+        b_den = den.tolist()
+        # fractional parts are kept as exact numerators over b_den and compared by cross-multiplication
         max_fractional_part_i = 1
-        for i in range(1, len(self.simplex_table)):
-            curr_fractional_part = abs(float(self.simplex_table[i][-1])) % 1
-            max_fractional_part = abs(float(self.simplex_table[max_fractional_part_i][-1])) % 1
-            if curr_fractional_part > max_fractional_part:
+        max_fractional_part = b_num[1] % b_den[1]
+        for i in range(2, len(b_num)):
+            curr_fractional_part = b_num[i] % b_den[i]
+            if curr_fractional_part * b_den[max_fractional_part_i] > max_fractional_part * b_den[i]:
                 max_fractional_part_i = i
+                max_fractional_part = curr_fractional_part
         return max_fractional_part_i
 
     def _add_clipping(self):
@@ -88,35 +95,48 @@ class GomoryMethod(SimplexMethod):
         """
         index = self._find_max_fractional_index()
         self.simplex_table.add_zero_row()
-        for i in range(len(self.simplex_table)):
-            if i == len(self.simplex_table)-1:
-                self.simplex_table[i].insert(-1, 1)
-            else:
-                self.simplex_table[i].insert(-1, 0)
-        clipping_coeffs = []
-        for j, coeff in enumerate(self.simplex_table[index]):
-            if coeff != 0:
-                self.simplex_table.set_item(-1, j, -(coeff.numerator % coeff.denominator), coeff.denominator)
-                clipping_coeffs.append(self.simplex_table[-1][j])
+        self.simplex_table.add_zero_column()
+        num, den = self.simplex_table.get_arrays()
+        num_rows = len(num)
+        # the clipping is formed from the negative fractional parts of the row, the new variable gets the coefficient 1
+        clipping_num = -(num[index] % den[index])
+        clipping_num[-2] = den[index]
+        self.simplex_table.set_row(-1, clipping_num, den[index])
+        clipping_coeffs = [self.simplex_table.get_item(-1, j) for j in np.flatnonzero(num[index])]
         self.clipping_history.append(clipping_coeffs[1:])
-        self.basic_vars.append(len(self.simplex_table) - 1)
+        self.basic_vars = np.append(self.basic_vars, np.int32(num_rows - 1))
 
     def _get_key_row(self):
-        beta = [x[-1] if x[-1] < 0 else 0 for x in self.simplex_table[1:]]
-        key_row = 0
-        for b in range(len(beta)):
-            if abs(beta[b]) >= abs(beta[key_row]):
-                key_row = b
-        return key_row + 1
+        """
+        The method searches for the resolving row of the dual simplex step: the row with the largest negative b.
+        Ties are resolved in favour of the smallest index, which keeps the choice consistent between iterations
+        as the finiteness argument of the Gomory method requires
+        :return: key_row (int): index of the resolving row
+        """
+        num, den = self.simplex_table.get_arrays()
+        b_num = num[:, -1].tolist()
+        b_den = den.tolist()
+        # the values of b are compared exactly by cross-multiplication, only the negative ones are candidates
+        key_row = 1
+        max_beta_num, max_beta_den = 0, 1
+        for i in range(1, len(b_num)):
+            if b_num[i] < 0 and -b_num[i] * max_beta_den > max_beta_num * b_den[i]:
+                key_row = i
+                max_beta_num, max_beta_den = -b_num[i], b_den[i]
+        return key_row
 
     def _get_key_column(self, key_row):
-        tetha = [x / y if y < 0 else float('inf') for x, y in
-                 zip(self.simplex_table[0][:-2], self.simplex_table[key_row][:-2])]
-        key_column = 0
-        for t in range(len(tetha)):
-            if tetha[t] <= tetha[key_column]:
-                key_column = t
-        return key_column
+        num, den = self.simplex_table.get_arrays()
+        x = num[0, :-2].tolist()
+        y = num[key_row, :-2].tolist()
+        # tetha = (x / den[0]) / (y / den[key_row]), the positive factor den[key_row] / den[0] is common to all the
+        # columns, so x / y are compared, exactly by cross-multiplication (y of the candidates is negative);
+        # the last of the minimal ratios is taken, the last column if there are no candidates
+        key_column = None
+        for j in range(len(x)):
+            if y[j] < 0 and (key_column is None or x[j] * y[key_column] <= x[key_column] * y[j]):
+                key_column = j
+        return len(x) - 1 if key_column is None else key_column
 
 
 
@@ -0,0 +1,94 @@
+from warnings import warn
+import numpy as np
+from simplex_method import SimplexMethod
+from simplex_table import _parse_constraint
+
+
+class RevisedSimplexMethod(SimplexMethod):
+    __slots__ = ()
+
+    # the inverse of the basis is updated in place at every step and recomputed from scratch with this period
+    REFACTOR_PERIOD = 50
+    EPS = 1e-9
+
+    def __init__(self, num_vars: int, constraints: list, objective_function: tuple):
+        """
+        The method calls the constructor of the SimplexMethod parent class, which builds the simplex table.
+        The revised simplex method keeps the constraint matrix unchanged and maintains only the inverse of the basis,
+        so a step costs O(m^2 + mn) instead of updating the whole m x n simplex table.
+        Unlike the rest of the package, it computes in floating point and returns floats instead of exact fractions.
+        The constraints are checked before the simplex table is built, so that the first phase is never run
+        :param num_vars: number of variables
+        :param constraints: list of constraints (only '<=' constraints, whose slack variables form the first basis)
+         (for example ['1x_1 + 2x_2 <= 4', '2x_3 + 3x_1 <= 5'])
+        :param objective_function: tuple in which two string values are specified: objective function
+         (for example, '2x_1 + 4x_3 + 5x_2') optimization direction ('min' or 'max')
+        """
+        if any(_parse_constraint(constraint)[1] != '<=' for constraint in constraints):
+            raise ValueError("Revised simplex method needs a slack basis: only '<=' constraints are supported")
+        super().__init__(num_vars, constraints, objective_function)
+
+    def solve(self):
+        """
+        The method is designed to solve the problem of linear programming by the revised simplex method.
+        At each iteration the simplex multipliers y = c_B B^-1 give the reduced costs c_j - y a_j of all the columns,
+        the column with the largest positive reduced cost enters the basis, the resolving column B^-1 a_q
+        is used in the minimal ratio test and in the update of the inverse of the basis.
+        The values are computed in floating point, the simplex history is not recorded
+        :return:
+        optimum (float) – the optimal value of the objective function in the sign convention of SimplexMethod.solve
+        optimal_plane (dict) - optimal plan obtained by simplex method (solution of linear programming problem)
+        """
+        num, den = self.simplex_table.get_arrays()
+        A = num[1:, :-1] / den[1:, np.newaxis]
+        b = num[1:, -1] / den[1:]
+        c = num[0, :-1] / den[0]
+        basis = self.basic_vars[1:].copy()
+        step = 0
+        while True:
+            if step % self.REFACTOR_PERIOD == 0:
+                B_inv = np.linalg.inv(A[:, basis])
+            x_B = B_inv @ b
+            y = c[basis] @ B_inv
+            reduced_costs = c - y @ A
+            if np.all(reduced_costs <= self.EPS):
+                break
+            # the last of the maximal reduced costs is taken as with SimplexMethod._find_key_column
+            key_column = len(reduced_costs) - 1 - int(np.argmax(reduced_costs[::-1]))
+            d = B_inv @ A[:, key_column]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratios = np.where(d > self.EPS, x_B / d, np.inf)
+            key_row = int(np.argmin(ratios))
+            if ratios[key_row] == float("inf"):
+                raise ValueError("Unbounded solution")
+            if ratios[key_row] <= self.EPS:
+                warn("Dengeneracy")
+            basis[key_row] = key_column
+            self._update_inverse(B_inv, d, key_row)
+            step += 1
+        self.basic_vars[1:] = basis
+        x_B = B_inv @ b
+        optimum = float(num[0, -1] / den[0] - c[basis] @ x_B)
+        optimal_plane = {}
+        for var, value in zip(basis, x_B):
+            if var < self.num_vars:
+                optimal_plane['x_' + str(var + 1)] = float(value)
+        for i in range(0, self.num_vars):
+            if i not in basis:
+                optimal_plane['x_' + str(i + 1)] = 0
+        return optimum, optimal_plane
+
+    @staticmethod
+    def _update_inverse(B_inv, d, key_row: int):
+        """
+        The method updates the inverse of the basis in place after the column with B^-1 a_q = d
+        has replaced the basic variable of the key_row row (product form of the inverse)
+        :param B_inv: inverse of the basis
+        :param d: resolving column of the revised simplex method
+        :param key_row: index of the row of the leaving basic variable
+        :return: None
+        """
+        B_inv[key_row] /= d[key_row]
+        factor = d.copy()
+        factor[key_row] = 0
+        B_inv -= np.outer(factor, B_inv[key_row])
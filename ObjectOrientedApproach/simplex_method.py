@@ -1,11 +1,16 @@
+import math
 from warnings import warn
-import copy
-from simplex_table import SimplexTable
+import numpy as np
+from simplex_table import SimplexTable, mpq
+import _simplex_core
 
 
 class SimplexMethod(object):
+    __slots__ = ('simplex_history', 'basic_vars_history', 'num_vars', 'objective', 'objective_function', 'constraints',
+                 'simplex_table', 'r_rows', 'num_s_vars', 'num_r_vars', 'basic_vars', 'record_history', 'pricing')
 
-    def __init__(self, num_vars: int, constraints: list, objective_function: str):
+    def __init__(self, num_vars: int, constraints: list, objective_function: str, record_history: bool = False,
+                 pricing: str = 'dantzig'):
         """
         The method is designed to initialize the parameters of the simplex algorithm:
         - formation of the initial simplex table,
@@ -17,7 +22,14 @@ class SimplexMethod(object):
          (for example ['1x_1 + 2x_2 >= 4', '2x_3 + 3x_1 <= 5', 'x_3 + 3x_2 = 6'])
         :param objective_function: tuple in which two string values are specified: objective function
          (for example, '2x_1 + 4x_3 + 5x_2') optimization direction ('min' or 'max')
+        :param record_history: if True, the simplex table and basic variables are saved after each step
+        :param pricing: rule of choosing the resolving column: 'dantzig' (the largest coefficient of the objective
+         function) or 'steepest_edge' (the largest coefficient relative to the norm of its column)
         """
+        if pricing not in ('dantzig', 'steepest_edge'):
+            raise ValueError(f"Unknown pricing rule: {pricing}")
+        self.record_history = record_history
+        self.pricing = pricing
         self.simplex_history = {}
         self.basic_vars_history = {}
         self.num_vars = num_vars
@@ -26,11 +38,18 @@ class SimplexMethod(object):
         self.constraints = constraints
         self.simplex_table = SimplexTable(self.num_vars, self.constraints, self.objective, self.objective_function)
         self.r_rows, self.num_s_vars, self.num_r_vars = self.simplex_table.get_matrix_params()
-        self.basic_vars = [0 for _ in range(len(self.simplex_table))]
-        r_index = self.num_r_vars + self.num_s_vars
-        for i in self.basic_vars:
-            if i > r_index:
-                raise ValueError("Infeasible solution")
+        self.basic_vars = np.zeros(len(self.simplex_table), dtype=np.int32)
+        num, den = self.simplex_table.get_arrays()
+        s_index = self.num_vars
+        r_index = self.num_vars + self.num_s_vars
+        s_rows = np.setdiff1d(np.arange(1, len(self.basic_vars)), self.r_rows)
+        if len(s_rows):
+            # rows without an r variable have a slack variable with the coefficient 1 in the basis
+            self.basic_vars[s_rows] = s_index + np.argmax(num[s_rows, s_index:r_index] > 0, axis=1)
+        if self.r_rows:
+            # rows with an r variable start the first phase with it in the basis
+            self.basic_vars[self.r_rows] = r_index + np.argmax(num[self.r_rows, r_index:-1] > 0, axis=1)
+            self._phase1()
         self._delete_r_vars()
         #self.simplex_vals, self.simplex_solution = self.solve()
 
@@ -44,38 +63,75 @@ class SimplexMethod(object):
         optimum (float) – the optimal value of the objective function obtained by the simplex method
         optimal_plane (dict) - optimal plan obtained by simplex method (solution of linear programming problem)
         """
-        for row, column in enumerate(self.basic_vars[1:]):
-            if self.simplex_table[0][column] != 0:
-                const = -self.simplex_table[0][column]
-                result = self.simplex_table.multiply_const_row(const, row)
-                self.simplex_table[0] = self.simplex_table.sum_rows(self.simplex_table[0], result)
-        self.simplex_history['Initial Simplex-method table'] = (copy.deepcopy(self.simplex_table.get_table()))
-        self.basic_vars_history['Initial Simplex-method table'] = copy.deepcopy(self.basic_vars)
+        table = self.simplex_table
+        num, den = table.get_arrays()
+        coeffs = num[0, self.basic_vars[1:]]
+        rows = np.flatnonzero(coeffs) + 1
+        if len(rows):
+            # the basic columns are zeroed in the row of the objective function at once: F - coeffs @ rows,
+            # the rows are brought to their common denominator, so the product stays in integers
+            lcm = math.lcm(*den[rows].tolist())
+            if num.dtype != np.int64 or lcm > _simplex_core.INT64_BOUND or self._product_overflows(coeffs, rows, lcm):
+                # the product is computed in Python ints, set_row converts the table if the new row does not fit int64
+                num, den, coeffs = num.astype(object), den.astype(object), coeffs.astype(object)
+            scale = coeffs[rows - 1] * (lcm // den[rows])
+            table.set_row(0, num[0] * lcm - scale @ num[rows], den[0] * lcm)
+        if self.record_history:
+            self.simplex_history['Initial Simplex-method table'] = self.simplex_table.snapshot()
+            self.basic_vars_history['Initial Simplex-method table'] = self.basic_vars.copy()
+        self._driver('Simplex-method step')
+        optimum = self.simplex_table.get_item(0, -1)
+        optimal_plane = self.get_solution()
+        return optimum, optimal_plane
+
+    def _product_overflows(self, coeffs, rows: np.ndarray, lcm: int):
+        """
+        The method estimates the largest value of the row num[0] * lcm - (coeffs * lcm / den) @ num[rows],
+        which zeroes the basic columns in the row of the objective function
+        :param coeffs: values of the basic columns in the row of the objective function
+        :param rows: indexes of the rows with a non-zero value in the row of the objective function
+        :param lcm: common denominator of the rows
+        :return: condition (bool): True if the row cannot be computed in int64 with a margin below 2 ** 63
+        """
+        num, den = self.simplex_table.get_arrays()
+        magnitude = lcm * (np.abs(num[0]).max() + (np.abs(coeffs[rows - 1]) / den[rows]) @ np.abs(num[rows]).max(axis=1))
+        return magnitude >= 2 ** 62
+
+    def _driver(self, step_name: str):
+        """
+        The method performs the steps of the simplex method for the objective function in the row 0 of the table
+        until its optimality condition is met. The first phase and the problem itself share this loop and the table,
+        the phases differ only in the row of the objective function
+        :param step_name: name of the steps in the history of the method
+        :return: None
+        """
+        if self._compiled() and not self.record_history:
+            # without the history the whole loop runs in the compiled kernel
+            self._run_simplex_core()
         step = 1
         while not self._check_condition():
             key_column = self._find_key_column()
             key_row = self._find_key_row(key_column=key_column)
             self.simplex_step(key_column, key_row)
-            self.simplex_history[f'Simplex-method step {step}'] = copy.deepcopy(self.simplex_table.get_table())
-            self.basic_vars_history[f'Simplex-method step {step}'] = copy.deepcopy(self.basic_vars)
-
+            if self.record_history:
+                self.simplex_history[f'{step_name} {step}'] = self.simplex_table.snapshot()
+                self.basic_vars_history[f'{step_name} {step}'] = self.basic_vars.copy()
             step += 1
-        optimum = self.simplex_table[0][-1]
-        optimal_plane = self.get_solution()
-        return optimum, optimal_plane
 
     def get_solution(self):
         """
         The method generates an optimal plan based on the current simplex table.
         :return: optimal_plane (dict) - optimal plan obtained by simplex method (solution of linear programming problem)
         """
+        table = self.simplex_table
+        basic_vars = self.basic_vars[1:]
+        num_vars = self.num_vars
         optimal_plane = {}
-        for i, var in enumerate(self.basic_vars[1:]):
-            if var < self.num_vars:
-                optimal_plane['x_' + str(var + 1)] = self.simplex_table[i + 1][-1]
-        for i in range(0, self.num_vars):
-            if i not in self.basic_vars[1:]:
-                optimal_plane['x_' + str(i + 1)] = 0
+        mask = basic_vars < num_vars
+        for row, var in zip((np.flatnonzero(mask) + 1).tolist(), basic_vars[mask].tolist()):
+            optimal_plane['x_' + str(var + 1)] = table.get_item(row, -1)
+        for i in np.setdiff1d(np.arange(num_vars), basic_vars).tolist():
+            optimal_plane['x_' + str(i + 1)] = 0
         return optimal_plane
 
     def simplex_step(self, key_column: int, key_row: int):
@@ -90,30 +146,67 @@ class SimplexMethod(object):
         :return:
         """
         self.basic_vars[key_row] = key_column
-        pivot = self.simplex_table[key_row][key_column]
+        if self._compiled():
+            num, den = self.simplex_table.get_arrays()
+            if _simplex_core.pivot(num, den, key_row, key_column) > _simplex_core.INT64_BOUND:
+                self.simplex_table.to_python_ints()
+            return
+        pivot = self.simplex_table.get_item(key_row, key_column)
         self._normalize_to_pivot(key_row, pivot)
         self._make_key_column_zero(key_column, key_row)
+        self.simplex_table.ensure_exact()
+
+    def _compiled(self):
+        """
+        The method checks whether the compiled kernels can process the current simplex table:
+        numba is installed and the table has not been converted to Python ints (see SimplexTable.ensure_exact)
+        :return: condition (bool): True if the kernels of _simplex_core are used
+        """
+        num, den = self.simplex_table.get_arrays()
+        return _simplex_core.NUMBA_AVAILABLE and num.dtype == np.int64
+
+    def _run_simplex_core(self):
+        """
+        The method performs the steps of the simplex method in the compiled kernel until the optimality condition is met
+        :return: None
+        """
+        num, den = self.simplex_table.get_arrays()
+        status, degenerate = _simplex_core.run_simplex(num, den, self.basic_vars, self.pricing == 'steepest_edge')
+        if degenerate:
+            warn("Dengeneracy")
+        if status == _simplex_core.UNBOUNDED:
+            raise ValueError("Unbounded solution")
+        if status == _simplex_core.OVERFLOW:
+            # the steps left are performed by _driver in Python ints
+            self.simplex_table.to_python_ints()
 
     def _check_condition(self):
         """
         The method checks the optimality condition of the objective function for the current simplex table
-         (all values in the row of the objective function are negative or equal to zero)
+         (all values in the row of the objective function, except for b, are negative or equal to zero)
         :return: condition (bool): True if the optimality condition is met, False otherwise
         """
-        F = self.simplex_table[0]
-        negative_values = list(filter(lambda x: x <= 0, F))
-        condition = len(negative_values) == len(F)
+        num, den = self.simplex_table.get_arrays()
+        # the row shares a single positive denominator, so the signs of the numerators are checked
+        condition = bool(np.all(num[0, :-1] <= 0))
         return condition
 
     def _find_key_column(self):
         """
-        The method is designed to find the resolving column in the current simplex table
+        The method is designed to find the resolving column in the current simplex table.
+        Only the columns with a positive value in the row of the objective function improve it:
+        the Dantzig rule takes the largest of these values, the steepest edge rule divides their squares by
+        the squared norms of the columns, 1 + sum(a_ij ** 2), and takes the largest ratio
         :return: key_column (int):  index of the resolving column
         """
-        key_columns = 0
-        for i in range(0, len(self.simplex_table[0]) - 1):
-            if abs(self.simplex_table[0][i]) >= abs(self.simplex_table[0][key_columns]):
-                key_columns = i
+        num, den = self.simplex_table.get_arrays()
+        # the row shares a single positive denominator, so the numerators can be compared directly
+        F = num[0, :-1]
+        if self.pricing == 'steepest_edge':
+            gamma = 1 + np.sum((num[1:, :-1] / den[1:, np.newaxis]) ** 2, axis=0)
+            F = np.where(F > 0, F.astype(np.float64) ** 2 / gamma, -1)
+        # the last of the maximal elements is taken as the resolving one
+        key_columns = len(F) - 1 - int(np.argmax(F[::-1]))
 
         return key_columns
 
@@ -123,20 +216,40 @@ class SimplexMethod(object):
         :param key_column: index of the resolving column
         :return: key_row (int): index of the resolving string
         """
-        min_val = float("inf")
-        key_row = 0
-        for i in range(1, len(self.simplex_table)):
-            if self.simplex_table[i][key_column] > 0:
-                val = self.simplex_table[i][-1] / self.simplex_table[i][key_column]
-                if val < min_val:
-                    min_val = val
-                    key_row = i
-        if min_val == float("inf"):
+        num, den = self.simplex_table.get_arrays()
+        # b and the resolving column of a row share the row denominator, which cancels out in the ratio,
+        # the ratios are compared exactly and the first of the minimal ones is taken as by the compiled kernel
+        rows = np.flatnonzero(num[1:, key_column] > 0) + 1
+        if len(rows) == 0:
             raise ValueError("Unbounded solution")
-        if min_val == 0:
+        if num.dtype == object:
+            key_row = min(rows.tolist(), key=lambda i: mpq(int(num[i, -1]), int(num[i, key_column])))
+        else:
+            key_row = int(rows[self._argmin_ratio(num[rows, -1], num[rows, key_column])])
+        if num[key_row, -1] == 0:
             warn("Dengeneracy")
         return key_row
 
+    @staticmethod
+    def _argmin_ratio(num, den):
+        """
+        The method finds the first of the minimal ratios num / den exactly, without building fractions.
+        The candidate found in floating point is compared with all the ratios by cross-multiplication
+        and is replaced while there is a smaller one, the products of values within INT64_BOUND do not overflow int64
+        :param num: int64 numerators of the ratios
+        :param den: positive int64 denominators of the ratios
+        :return: index (int): index of the minimal ratio
+        """
+        index = int(np.argmin(num / den))
+        while True:
+            # the denominators are positive, so diff has the sign of num / den - num[index] / den[index]
+            diff = num * den[index] - num[index] * den
+            smaller = int(np.argmin(diff))
+            if diff[smaller] >= 0:
+                break
+            index = smaller
+        return int(np.argmax(diff == 0))
+
     def _normalize_to_pivot(self, key_row: int, pivot: float):
         """
         The method divides the resolving row of the current simplex table by the resolving element
@@ -144,8 +257,7 @@ class SimplexMethod(object):
         :param pivot: resolving element
         :return: None
         """
-        for i in range(len(self.simplex_table[0])):
-            self.simplex_table[key_row][i] /= pivot
+        self.simplex_table.divide_row(key_row, pivot)
 
     def _make_key_column_zero(self, key_column: int, key_row: int):
         """
@@ -155,40 +267,74 @@ class SimplexMethod(object):
         :param key_row: index of the permissive row
         :return: None
         """
-        num_columns = len(self.simplex_table[0])
-        for i in range(len(self.simplex_table)):
-            if i != key_row:
-                factor = self.simplex_table[i][key_column]
-                for j in range(num_columns):
-                    self.simplex_table[i][j] -= self.simplex_table[key_row][j] * factor
+        num, den = self.simplex_table.get_arrays()
+        factor = num[:, key_column].copy()
+        factor[key_row] = 0
+        # only the rows with a non-zero element in the resolving column change, the rest are left untouched
+        rows = np.flatnonzero(factor)
+        if len(rows) == 0:
+            return
+        # rank-1 update of the changed rows: num[rows] * den[key_row] - factor[rows] (outer) num[key_row],
+        # the outer product is formed only for the non-zero columns of the resolving row
+        columns = np.flatnonzero(num[key_row])
+        block = num[rows]
+        block *= den[key_row]
+        block[:, columns] -= np.multiply.outer(factor[rows], num[key_row, columns])
+        block_den = den[rows] * den[key_row]
+        gcd = np.gcd(np.gcd.reduce(block, axis=1), block_den)
+        block //= gcd[:, np.newaxis]
+        num[rows] = block
+        den[rows] = block_den // gcd
 
     def _delete_r_vars(self):
-        for i in range(len(self.simplex_table)):
-            non_r_length = self.num_vars + self.num_s_vars + 1
-            length = len(self.simplex_table[i])
-            while length != non_r_length:
-                del self.simplex_table[i][non_r_length-1]
-                length -= 1
+        # the r columns are located between the slack variables and b
+        non_r_length = self.num_vars + self.num_s_vars + 1
+        num, den = self.simplex_table.get_arrays()
+        if num.shape[1] != non_r_length:
+            self.simplex_table.delete_columns(non_r_length - 1, num.shape[1] - 1)
 
     def _phase1(self):
-        # Objective function here is minimize r1+ r2 + r3 + ... + rn
+        """
+        The method finds the first feasible plan of the problem with the r variables in the basis.
+        The row of the objective function is replaced with the sum of the r variables, which is minimized by _driver,
+        then the r variables left in the basis at zero level are driven out of it (see _drive_out_r_vars)
+        and the row of the objective function is restored, the rows of the constraints are not copied
+        :return: None
+        """
+        table = self.simplex_table
+        num, den = table.get_arrays()
+        objective_num, objective_den = num[0].copy(), den[0]
+        # Objective function here is minimize r1+ r2 + r3 + ... + rn: the row holds -1 in the r columns plus
+        # the sum of the r rows, which are brought to their common denominator
         r_index = self.num_vars + self.num_s_vars
-        for i in range(r_index, len(self.simplex_table[0]) - 1):
-            self.simplex_table.set_item(0, i, -1)
-        for i in self.r_rows:
-            self.simplex_table[0] = self.simplex_table.sum_rows_by_index(0, i)
-            self.basic_vars[i] = r_index
-            r_index += 1
-        s_index = self.num_vars
-        for i in range(1, len(self.basic_vars)):
-            if self.basic_vars[i] == 0:
-                self.basic_vars[i] = s_index
-                s_index += 1
-        step = 0
-        while not self._check_condition():
-            key_column = self._find_key_column()
-            key_row = self._find_key_row(key_column=key_column)
-            self.simplex_step(key_column, key_row)
-            self.simplex_history[f'Simplex-method step {step}'] = copy.deepcopy(self.simplex_table.get_table())
-            self.basic_vars_history[f'Simplex-method step {step}'] = copy.deepcopy(self.simplex_table.get_table())
-            step += 1
+        lcm = np.lcm.reduce(den[self.r_rows])
+        phase1_num = (lcm // den[self.r_rows]) @ num[self.r_rows]
+        phase1_num[r_index:-1] -= lcm
+        table.set_row(0, phase1_num, lcm)
+        self._driver('Phase 1 step')
+        # the sum of the r variables left after the first phase is positive only if there is no feasible plan
+        if table.get_item(0, -1) != 0:
+            raise ValueError("Infeasible solution")
+        self._drive_out_r_vars()
+        table.set_row(0, objective_num, objective_den)
+
+    def _drive_out_r_vars(self):
+        """
+        The method removes the r variables left in the basis at zero level after the first phase.
+        Each of them is replaced by the first variable of its row with a non-zero coefficient that is not an r variable,
+        the b of the row is zero, so the step keeps the plan feasible. A row without such a variable is a linear
+        combination of the other constraints and is deleted
+        :return: None
+        """
+        r_index = self.num_vars + self.num_s_vars
+        redundant_rows = []
+        for i in (np.flatnonzero(self.basic_vars[1:] >= r_index) + 1).tolist():
+            num, den = self.simplex_table.get_arrays()
+            columns = np.flatnonzero(num[i, :r_index])
+            if len(columns) == 0:
+                redundant_rows.append(i)
+                continue
+            self.simplex_step(int(columns[0]), i)
+        if redundant_rows:
+            self.simplex_table.delete_rows(redundant_rows)
+            self.basic_vars = np.delete(self.basic_vars, redundant_rows)
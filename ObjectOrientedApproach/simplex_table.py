@@ -1,4 +1,39 @@
 from fractions import Fraction
+try:
+    from gmpy2 import mpq
+except ImportError:  # gmpy2 is optional, the internal exact comparisons fall back to the standard library fractions
+    mpq = Fraction
+import math
+import re
+import numpy as np
+from _simplex_core import INT64_BOUND
+
+
+_TERM_RE = re.compile(r'([+-]?)\s*(\d*)\s*x_(\d+)')
+_RELATION_RE = re.compile(r'(<=|>=|=)')
+
+
+def _parse_expression(expression: str):
+    """
+    Parses a linear expression (for example, '2x_1 - 4x_3 + x_2') into its terms
+    :param expression: linear expression
+    :return: terms (list): list of (index, coeff) pairs, where index is the zero-based index of the variable
+    """
+    return [(int(index) - 1, -int(coeff or 1) if sign == '-' else int(coeff or 1))
+            for sign, coeff, index in _TERM_RE.findall(expression)]
+
+
+def _parse_constraint(constraint: str):
+    """
+    Splits a constraint (for example, '1x_1 + 2x_2 >= 4') into the terms of the left side, relation and right side
+    :param constraint: constraint
+    :return:
+    terms (list): list of (index, coeff) pairs of the left side
+    relation (str): '<=', '>=' or '='
+    rhs (int): right side of the constraint
+    """
+    lhs, relation, rhs = _RELATION_RE.split(constraint, maxsplit=1)
+    return _parse_expression(lhs), relation, int(rhs)
 
 
 class SimplexTable:
@@ -11,52 +46,50 @@ class SimplexTable:
         :param objective: optimization direction ('min' or 'max')
         :param objective_function: objective function (for example, '2x_1 + 4x_3 + 5x_2')
         """
+        parsed_constraints = [_parse_constraint(constraint) for constraint in constraints]
         self._num_s_vars = 0  # number of slack and surplus variables
-        self._num_r_vars = 0  # number of additional variables to balance equality and less than equal to
-        for expression in constraints:
-            if '>=' in expression:
-                self._num_s_vars += 1
-            elif '<=' in expression:
+        self._num_r_vars = 0  # number of additional variables to balance equality and greater than equal to
+        for _, relation, _ in parsed_constraints:
+            if relation == '>=':
                 self._num_s_vars += 1
                 self._num_r_vars += 1
-            elif '=' in expression:
+            elif relation == '<=':
+                self._num_s_vars += 1
+            elif relation == '=':
                 self._num_r_vars += 1
         total_vars = num_vars + self._num_s_vars + self._num_r_vars
 
-        self._coeff_matrix = [[Fraction("0/1") for _ in range(total_vars + 1)] for _ in range(len(constraints) + 1)]
+        # every row i stores the values _num[i, :] / _den[i]; all coefficients are integers, so every row starts with 1
+        self._num = np.zeros((len(constraints) + 1, total_vars + 1), dtype=np.int64)
+        self._den = np.ones(len(constraints) + 1, dtype=np.int64)
         s_index = num_vars
         r_index = num_vars + self._num_s_vars
         self._r_rows = []  # stores the non -zero index of r
-        for i in range(1, len(constraints) + 1):
-            constraint = constraints[i - 1].split(' ')
-
-            for j in range(len(constraint)):
-
-                if '_' in constraint[j]:
-                    coeff, index = constraint[j].split('_')
-                    if constraint[j - 1] == '-':
-                        self._coeff_matrix[i][int(index) - 1] = Fraction("-" + coeff[:-1] + "/1")
-                    else:
-                        self._coeff_matrix[i][int(index) - 1] = Fraction(coeff[:-1] + "/1")
-
-                elif constraint[j] == '<=':
-                    self._coeff_matrix[i][s_index] = Fraction("1/1")  # add surplus variable
-                    s_index += 1
-
-                elif constraint[j] == '>=':
-                    self._coeff_matrix[i][s_index] = Fraction("-1/1")  # slack variable
-                    self._coeff_matrix[i][r_index] = Fraction("1/1")  # r variable
-                    s_index += 1
-                    r_index += 1
-                    self._r_rows.append(i)
-
-                elif constraint[j] == '=':
-                    self._coeff_matrix[i][r_index] = Fraction("1/1")  # r variable
-                    r_index += 1
-                    self._r_rows.append(i)
-
-            self._coeff_matrix[i][-1] = Fraction(constraint[-1] + "/1")
+        for i, (terms, relation, rhs) in enumerate(parsed_constraints, start=1):
+            for index, coeff in terms:
+                self._num[i, index] = coeff
+
+            if relation == '<=':
+                self._num[i, s_index] = 1  # add surplus variable
+                s_index += 1
+
+            elif relation == '>=':
+                self._num[i, s_index] = -1  # slack variable
+                self._num[i, r_index] = 1  # r variable
+                s_index += 1
+                r_index += 1
+                self._r_rows.append(i)
+
+            elif relation == '=':
+                self._num[i, r_index] = 1  # r variable
+                r_index += 1
+                self._r_rows.append(i)
+
+            self._num[i, -1] = rhs
         self._update_objective_function(objective_function, objective)
+        # the table is a view of the buffers, which hold spare rows and columns for the clippings of the Gomory method
+        self._buffer = self._num, self._den
+        self.ensure_exact()
 
     def _update_objective_function(self, objective_function: str, objective: str):
         """
@@ -68,16 +101,9 @@ class SimplexTable:
         :param objective: – optimization direction ('min' or 'max')
         :return: None
         """
-        objective_function_coeffs = objective_function.split()
-        for i in range(len(objective_function_coeffs)):
-            if '_' in objective_function_coeffs[i]:
-                coeff, index = objective_function_coeffs[i].split('_')
-                if objective_function_coeffs[i-1] == '-':
-                    self.set_item(0, int(index)-1, int(coeff[:-1]))
-                else:
-                    self.set_item(0, int(index) - 1, -int(coeff[:-1]))
-                if 'max' in objective:
-                    self._coeff_matrix[0][int(index)-1] *= -1
+        # the row of the objective function has the denominator 1, so the coefficients are written as numerators
+        for index, coeff in _parse_expression(objective_function):
+            self._num[0, index] = coeff if 'max' in objective else -coeff
 
     def get_matrix_params(self):
         """
@@ -92,17 +118,121 @@ class SimplexTable:
     def get_table(self):
         """
         The method returns the current simplex table.
-        :return: coff_matrix(list): simplex table
+        :return: coff_matrix(list): simplex table as a list of lists of fractions
+        """
+        return self.to_fractions(self.snapshot())
+
+    def snapshot(self):
+        """
+        The method copies the arrays of the current simplex table for recording it in the history of the method
+        :return: simplex_table (tuple): independent copy of the arrays (num, den)
         """
-        return self._coeff_matrix
+        return self._num.copy(), self._den.copy()
+
+    @staticmethod
+    def to_fractions(simplex_table: tuple):
+        """
+        The method converts a simplex table given as a pair of arrays (num, den) into a list of lists of fractions
+        :param simplex_table: pair of arrays (num, den), for example a snapshot from the history of the method
+        :return: table (list): list of lists of Fraction
+        """
+        num, den = simplex_table
+        return [[Fraction(int(n), int(d)) for n in num_row] for num_row, d in zip(num, den)]
+
+    def get_arrays(self):
+        """
+        The method returns the arrays in which the current simplex table is stored.
+        Every row i of the table holds the values num[i, :] / den[i] with a single positive denominator
+        The arrays are replaced when the table grows or is converted to Python ints, so they are not kept between steps
+        :return:
+        num (ndarray): int64 numerators of shape (rows, cols), object arrays of Python ints after ensure_exact
+        den (ndarray): int64 row denominators of shape (rows,), object arrays of Python ints after ensure_exact
+        """
+        return self._num, self._den
 
     def add_zero_row(self):
         """
-        The method adds a string consisting of zeros to the current simplex table
+        The method adds a string consisting of zeros to the current simplex table.
+        The table takes a spare row of the buffers, they are reallocated with doubled capacity when the spare rows run out
+        :return: None
+        """
+        num_rows, num_columns = self._num.shape
+        if num_rows == len(self._buffer[1]):
+            self._allocate(max(num_rows, 1), self._buffer[0].shape[1] - num_columns, self._num.dtype)
+        buffer_num, buffer_den = self._buffer
+        buffer_num[num_rows, :num_columns] = 0
+        buffer_den[num_rows] = 1
+        self._num, self._den = buffer_num[:num_rows + 1, :num_columns], buffer_den[:num_rows + 1]
+
+    def add_zero_column(self):
+        """
+        The method adds a column consisting of zeros to the current simplex table in front of the b column.
+        Only the b column is moved to a spare column of the buffers, they are reallocated with doubled capacity
+        when the spare columns run out
+        :return: None
+        """
+        num_rows, num_columns = self._num.shape
+        if num_columns == self._buffer[0].shape[1]:
+            self._allocate(len(self._buffer[1]) - num_rows, num_columns, self._num.dtype)
+        buffer_num = self._buffer[0]
+        buffer_num[:num_rows, num_columns] = buffer_num[:num_rows, num_columns - 1]
+        buffer_num[:num_rows, num_columns - 1] = 0
+        self._num = buffer_num[:num_rows, :num_columns + 1]
+
+    def ensure_exact(self):
+        """
+        The method converts the current simplex table to Python ints if its values exceed INT64_BOUND,
+        the products of larger values may overflow int64 in the next step of the simplex method
+        :return: None
+        """
+        if self._num.dtype != object and not self._fits_int64(self._num, self._den):
+            self.to_python_ints()
+
+    def to_python_ints(self):
+        """
+        The method converts the arrays of the current simplex table into arrays of Python ints, which cannot overflow.
+        The spare rows and columns of the buffers are kept
         :return: None
         """
-        zero_row = [0 for _ in self._coeff_matrix[1]]
-        self._coeff_matrix.append(zero_row)
+        num_rows, num_columns = self._num.shape
+        self._allocate(len(self._buffer[1]) - num_rows, self._buffer[0].shape[1] - num_columns, object)
+
+    def _allocate(self, extra_rows: int, extra_columns: int, dtype):
+        """
+        The method copies the current simplex table into new buffers with the specified number of spare rows and columns
+        :param extra_rows: number of spare rows
+        :param extra_columns: number of spare columns
+        :param dtype: dtype of the new buffers, np.int64 or object
+        :return: None
+        """
+        num_rows, num_columns = self._num.shape
+        buffer_num = np.zeros((num_rows + extra_rows, num_columns + extra_columns), dtype=dtype)
+        buffer_den = np.ones(num_rows + extra_rows, dtype=dtype)
+        buffer_num[:num_rows, :num_columns] = self._num
+        buffer_den[:num_rows] = self._den
+        self._buffer = buffer_num, buffer_den
+        self._num, self._den = buffer_num[:num_rows, :num_columns], buffer_den[:num_rows]
+
+    def delete_columns(self, start: int, stop: int):
+        """
+        The method removes the columns from start to stop (not including) from the current simplex table
+        :param start: index of the first removed column
+        :param stop: index of the column following the last removed one
+        :return: None
+        """
+        # the kept parts are joined by slices in a single copy, without building an index array as np.delete does
+        self._num = np.hstack((self._num[:, :start], self._num[:, stop:]))
+        self._buffer = self._num, self._den
+
+    def delete_rows(self, rows: list):
+        """
+        The method removes the rows with the specified indexes from the current simplex table
+        :param rows: indexes of the removed rows
+        :return: None
+        """
+        self._num = np.delete(self._num, rows, axis=0)
+        self._den = np.delete(self._den, rows)
+        self._buffer = self._num, self._den
 
     def sum_rows_by_index(self, index_left: int, index_right: int):
         """
@@ -110,46 +240,90 @@ class SimplexTable:
         The indexes of the summed rows are set in the parameters
         :param index_left: index of the first line of the term
         :param index_right: index of the second line of the term
-        :return:
+        :return: sum_rows (tuple): result summarizes, pair (num, den)
         """
-        row_left = self._coeff_matrix[index_left]
-        row_right = self._coeff_matrix[index_right]
-        size = len(self._coeff_matrix[index_left])
-        sum_rows = [
-            row_left[i] + row_right[i] for i in range(size)
-        ]
-        return sum_rows
+        return self.sum_rows(self[index_left], self[index_right])
 
-    def sum_rows(self, row_left: list, row_right: list):
+    def sum_rows(self, row_left: tuple, row_right: tuple):
         """
         The method summarizes two rows of the current simplex table. The lines are set in the parameters
-        :param row_left: the first line is the summand
-        :param row_right: the second line is the summand
-        :return: sum_rows (list): result summarizes
+        :param row_left: the first line is the summand, pair (num, den) of the numerators and the row denominator
+        :param row_right: the second line is the summand, pair (num, den) of the numerators and the row denominator
+        :return: sum_rows (tuple): result summarizes, pair (num, den)
         """
-        size = len(row_left)
-        sum_rows = [row_left[i] + row_right[i] for i in range(size)]
-        return sum_rows
+        num_left, den_left = row_left
+        num_right, den_right = row_right
+        return self._reduce_row(num_left * den_right + num_right * den_left, den_left * den_right)
 
-    def multiply_const_row(self, const: float, index: int):
+    def multiply_const_row(self, const: Fraction, index: int):
         """
         The method multiplies the string by a constant.
         The constant and index of the multiplied string are specified in the parameters
         :param const: the constant by which the string is multiplied
         :param index: index of the string to be multiplied by a constant
-        :return: result (list): the result of multiplying a string by a constant
+        :return: result (tuple): the result of multiplying a string by a constant, pair (num, den) of Python ints,
+         the constant is not bounded, so its product may not fit int64
+        """
+        const = Fraction(const)
+        return self._reduce_row(self._num[index + 1].astype(object) * const.numerator,
+                                int(self._den[index + 1]) * const.denominator)
+
+    def divide_row(self, index: int, const: Fraction):
+        """
+        The method divides the row of the current simplex table by a non-zero constant in place
+        :param index: index of the row to be divided
+        :param const: the constant by which the row is divided
+        :return: None
         """
-        result = [const * i for i in self._coeff_matrix[index + 1]]
-        return result
+        const = Fraction(const)
+        num = self._num[index] * int(const.denominator)
+        den = self._den[index] * int(const.numerator)
+        # the sign of the constant is moved to the numerators, so that the denominator stays positive
+        if den < 0:
+            num, den = -num, -den
+        self.set_row(index, num, den)
+
+    def set_row(self, index: int, num, den: int):
+        """
+        The method replaces the row of the current simplex table with the values num / den
+        :param index: index of the row
+        :param num: numerators of the new row
+        :param den: positive denominator of the new row
+        :return: None
+        """
+        num, den = self._reduce_row(num, den)
+        # the table is converted to Python ints before the row is written, if the row does not fit its values
+        if self._num.dtype != object and not self._fits_int64(num, den):
+            self.to_python_ints()
+        self[index] = num, den
+
+    def get_item(self, row, col):
+        return Fraction(int(self._num[row, col]), int(self._den[row]))
 
     def set_item(self, row, col, value_numerator, value_denominator=1):
-        self._coeff_matrix[row][col] = Fraction(value_numerator, value_denominator)
+        value = Fraction(value_numerator, value_denominator)
+        # the row is brought to the common denominator of its values and the new value in Python ints,
+        # set_row converts the table if the new row does not fit int64
+        den = math.lcm(int(self._den[row]), value.denominator)
+        num = self._num[row].astype(object) * (den // int(self._den[row]))
+        num[col] = value.numerator * (den // value.denominator)
+        self.set_row(row, num, den)
+
+    @staticmethod
+    def _fits_int64(num, den):
+        return bool(np.all(np.abs(num) <= INT64_BOUND) and np.all(np.asarray(den) <= INT64_BOUND))
+
+    @staticmethod
+    def _reduce_row(num, den):
+        # the denominator is brought to the dtype of the row, a Python int past int64 is not converted to a C long
+        gcd = np.gcd(np.gcd.reduce(num), np.asarray(den, dtype=num.dtype))
+        return num // gcd, den // gcd
 
-    def __setitem__(self, index, data):
-        self._coeff_matrix[index] = data
+    def __setitem__(self, index, row):
+        self._num[index], self._den[index] = row
 
     def __getitem__(self, index):
-        return self._coeff_matrix[index]
+        return self._num[index], self._den[index]
 
     def __len__(self):
-        return len(self._coeff_matrix)
+        return len(self._num)
@@ -0,0 +1,28 @@
+import os
+import sys
+import warnings
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# FunctionalApproach is imported as a package from the root of the repository,
+# the modules of ObjectOrientedApproach import each other as scripts from their own directory
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'ObjectOrientedApproach'))
+
+import _simplex_core
+from FunctionalApproach import _simplex_numba
+
+
+@pytest.fixture(params=['numba', 'numpy'], autouse=True)
+def implementation(request, monkeypatch):
+    """
+    Runs every test with the compiled kernels and with the NumPy implementation of both approaches
+    """
+    if request.param == 'numba' and not (_simplex_numba.NUMBA_AVAILABLE and _simplex_core.NUMBA_AVAILABLE):
+        pytest.skip('numba is not installed')
+    if request.param == 'numpy':
+        monkeypatch.setattr(_simplex_numba, 'NUMBA_AVAILABLE', False)
+        monkeypatch.setattr(_simplex_core, 'NUMBA_AVAILABLE', False)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield request.param
@@ -0,0 +1,162 @@
+from fractions import Fraction
+import numpy as np
+import pytest
+from FunctionalApproach.gomory_module import gomory_solve, gomory_solve_batch, add_clipping
+from FunctionalApproach.table_printing import format_table, print_history_table
+from FunctionalApproach.simplex_module import simplex_solve, simplex_step, _simplex_solve
+from FunctionalApproach.table_tools import INT64_BOUND, argmin_ratio, sum_rows, multiply_const_row, axpy
+
+
+def test_less_equal_constraints():
+    problem = (2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('maximize', '8x_1 + 6x_2'))
+    optimum, plane = simplex_solve(*problem)[:2]
+    assert optimum == Fraction(-376, 9)
+    assert plane == {'x_1': Fraction(61, 18), 'x_2': Fraction(22, 9)}
+    integer_optimum, integer_plane = gomory_solve(*problem)[:2]
+    assert integer_optimum == -36
+    assert integer_plane == {'x_1': 3, 'x_2': 2}
+
+
+def test_results_are_standard_fractions():
+    optimum, plane = simplex_solve(2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('maximize', '8x_1 + 6x_2'))[:2]
+    assert type(optimum) is Fraction
+    assert all(type(value) in (Fraction, int) for value in plane.values())
+
+
+def test_greater_equal_constraints():
+    problem = (2, ['1x_1 + 1x_2 >= 3', '2x_1 + 1x_2 >= 4'], ('min', '3x_1 + 2x_2'))
+    optimum, plane = simplex_solve(*problem)[:2]
+    assert optimum == 7
+    assert plane == {'x_1': 1, 'x_2': 2}
+    integer_optimum, integer_plane = gomory_solve(*problem)[:2]
+    assert integer_optimum == 7
+    assert integer_plane == {'x_1': 1, 'x_2': 2}
+
+
+def test_equality_constraint():
+    problem = (3, ['1x_1 + 1x_2 + 1x_3 = 7', '2x_1 + 3x_2 <= 13', '1x_2 + 2x_3 <= 9'], ('max', '3x_1 + 2x_2 + 4x_3'))
+    optimum, plane = simplex_solve(*problem)[:2]
+    assert optimum == Fraction(-51, 2)
+    assert plane == {'x_1': Fraction(5, 2), 'x_2': 0, 'x_3': Fraction(9, 2)}
+    integer_optimum, integer_plane = gomory_solve(*problem)[:2]
+    assert integer_optimum == -25
+    assert integer_plane == {'x_1': 3, 'x_2': 0, 'x_3': 4}
+
+
+def test_r_variable_left_in_basis_at_zero_level():
+    problem = (2, ['1x_1 <= 5', '1x_1 + 1x_2 = 2', '4x_1 + 4x_2 >= 8', '1x_2 <= 7'], ('minimize', '- 5x_1'))
+    assert simplex_solve(*problem)[:2] == (-10, {'x_1': 2, 'x_2': 0})
+    assert gomory_solve(*problem)[:2] == (-10, {'x_1': 2, 'x_2': 0})
+
+
+def test_redundant_equality_constraint():
+    problem = (2, ['1x_1 + 1x_2 = 2', '2x_1 + 2x_2 = 4'], ('max', '1x_1 + 3x_2'))
+    assert simplex_solve(*problem)[:2] == (-6, {'x_1': 0, 'x_2': 2})
+
+
+def test_infeasible_problem():
+    with pytest.raises(ValueError, match='Infeasible solution'):
+        simplex_solve(2, ['1x_1 + 1x_2 >= 5', '1x_1 + 1x_2 <= 2'], ('max', '1x_1 + 1x_2'))
+
+
+def test_pivot_past_int64_bound():
+    big = INT64_BOUND - 2
+    rows = [[big, 1, 0, 3], [big - 1, -big, 1, 5], [3, 7, -big, 11]]
+    simplex_table = np.array(rows, dtype=np.int64), np.ones(3, dtype=np.int64)
+    basic_vars = [0, 0, 0]
+    for key_column, key_row in ((0, 1), (1, 2)):
+        simplex_table, basic_vars = simplex_step(simplex_table, basic_vars, key_column, key_row)
+        rows = [[Fraction(x) for x in row] for row in rows]
+        pivot = rows[key_row][key_column]
+        rows[key_row] = [x / pivot for x in rows[key_row]]
+        for i in range(len(rows)):
+            if i != key_row:
+                factor = rows[i][key_column]
+                rows[i] = [x - factor * y for x, y in zip(rows[i], rows[key_row])]
+    num, den = simplex_table
+    assert num.dtype == object
+    assert [[Fraction(int(x), int(den[i])) for x in row] for i, row in enumerate(num)] == rows
+
+
+def test_argmin_ratio_is_exact():
+    a = INT64_BOUND - 2
+    # the ratios differ by less than the precision of float64
+    num, den = np.array([a + 1, a, 1, a]), np.array([a + 2, a + 1, 1, a + 1])
+    assert (num / den)[0] == (num / den)[1]
+    assert argmin_ratio(num, den) == 1
+    assert argmin_ratio(num, den, last=True) == 3
+
+
+def test_row_helpers():
+    row1, row2 = (np.array([2, 5, 1, 0, 19]), 1), (np.array([4, 1, 0, 1, 16]), 2)
+    num, den = sum_rows(row1, row2)
+    assert num.tolist() == [8, 11, 2, 1, 54] and den == 2
+    num, den = multiply_const_row(Fraction(3, 4), row1)
+    assert num.tolist() == [6, 15, 3, 0, 57] and den == 4
+
+
+def test_batch_matches_separate_solves():
+    constraints = ['1x_1 + 1x_2 + 1x_3 = 7', '2x_1 + 3x_2 <= 13', '1x_2 + 2x_3 >= 3']
+    objective_functions = [('max', '3x_1 + 2x_2 + 4x_3'), ('min', '1x_1 + 2x_2 + 3x_3'), ('max', '1x_2')]
+    results = gomory_solve_batch(3, constraints, objective_functions)
+    assert [result[:2] for result in results] == [
+        gomory_solve(3, constraints, objective_function)[:2] for objective_function in objective_functions
+    ]
+
+
+def test_batch_infeasible_problem():
+    constraints = ['1x_1 + 1x_2 >= 5', '1x_1 + 1x_2 <= 2']
+    with pytest.raises(ValueError, match='Infeasible solution'):
+        gomory_solve(2, constraints, ('max', '1x_1 + 1x_2'))
+    with pytest.raises(ValueError, match='Infeasible solution'):
+        gomory_solve_batch(2, constraints, [('max', '1x_1 + 1x_2'), ('min', '1x_2')])
+
+
+def test_format_table():
+    table = [[8, 6, 0], [2, Fraction(9, 2), 19]]
+    assert format_table(table, ['x1', 'x2', 'b'], ['f(x)', 'x3']) == (
+        '      x1   x2   b\n'
+        'f(x)   8    6   0\n'
+        'x3     2  9/2  19'
+    )
+
+
+def test_print_history_table(capsys):
+    problem = (2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('maximize', '8x_1 + 6x_2'))
+    optimum, plane, history, basic_vars_history = gomory_solve(*problem, record_history=True)
+    assert list(history) == list(basic_vars_history)
+    assert list(history)[:2] == ['Initial Simplex-method', 'Simplex-method step 1']
+    assert 'Initial Gomory-method' in history and 'Gomory method step 1' in history
+    print_history_table(history, basic_vars_history, plane)
+    output = capsys.readouterr().out
+    assert output.startswith(
+        'Initial Simplex-method\n'
+        '      x1  x2  x3  x4   b\n'
+        'f(x)   8   6   0   0   0\n'
+        'x3     2   5   1   0  19\n'
+        'x4     4   1   0   1  16\n'
+        '\n'
+    )
+    assert output.endswith('Optimal point:\nx_2 2\nx_1 3\n')
+
+
+def test_add_clipping():
+    simplex_table, basic_vars = _simplex_solve(2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('max', '8x_1 + 6x_2'), False)[:2]
+    num_rows, num_columns = simplex_table[0].shape
+    simplex_table, basic_vars = add_clipping(simplex_table, basic_vars)
+    num, den = simplex_table
+    assert num.shape == (num_rows + 1, num_columns + 1)
+    assert len(basic_vars) == num_rows + 1
+    assert num[-1, -2] == den[-1] and num[-1, -1] < 0
+
+
+@pytest.mark.parametrize('big', [False, True])
+def test_axpy(big):
+    a = INT64_BOUND - 2 if big else 7
+    simplex_table = np.array([[a, 1, 3], [2, a, -5]], dtype=np.int64), np.array([a, 3], dtype=np.int64)
+    const = Fraction(-a, a - 1)
+    expected = [Fraction(x, a) + const * Fraction(y, 3) for x, y in zip([a, 1, 3], [2, a, -5])]
+    num, den = axpy(simplex_table, 0, 1, const)
+    # the row stays in int64 while its values fit INT64_BOUND
+    assert num.dtype == (object if big else np.int64)
+    assert [Fraction(int(x), int(den[0])) for x in num[0]] == expected
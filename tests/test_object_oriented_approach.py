@@ -0,0 +1,147 @@
+from fractions import Fraction
+import numpy as np
+import pytest
+import _simplex_core
+from gomory_method import GomoryMethod
+from revised_simplex_method import RevisedSimplexMethod
+from simplex_method import SimplexMethod
+
+
+def test_less_equal_constraints():
+    problem = (2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('maximize', '8x_1 + 6x_2'))
+    optimum, plane = SimplexMethod(*problem).solve()
+    assert optimum == Fraction(-376, 9)
+    assert plane == {'x_1': Fraction(61, 18), 'x_2': Fraction(22, 9)}
+    assert GomoryMethod(*problem).integer_solve() == (-36, {'x_1': 3, 'x_2': 2})
+
+
+def test_results_are_standard_fractions():
+    method = SimplexMethod(2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('maximize', '8x_1 + 6x_2'))
+    optimum, plane = method.solve()
+    assert type(optimum) is Fraction
+    assert all(type(value) in (Fraction, int) for value in plane.values())
+    assert all(type(value) is Fraction for row in method.simplex_table.get_table() for value in row)
+
+
+def test_greater_equal_constraints():
+    problem = (2, ['1x_1 + 1x_2 >= 3', '2x_1 + 1x_2 >= 4'], ('min', '3x_1 + 2x_2'))
+    assert SimplexMethod(*problem).solve() == (7, {'x_1': 1, 'x_2': 2})
+    assert GomoryMethod(*problem).integer_solve() == (7, {'x_1': 1, 'x_2': 2})
+
+
+def test_equality_constraint():
+    problem = (3, ['1x_1 + 1x_2 + 1x_3 = 7', '2x_1 + 3x_2 <= 13', '1x_2 + 2x_3 <= 9'], ('max', '3x_1 + 2x_2 + 4x_3'))
+    optimum, plane = SimplexMethod(*problem).solve()
+    assert optimum == Fraction(-51, 2)
+    assert plane == {'x_1': Fraction(5, 2), 'x_2': 0, 'x_3': Fraction(9, 2)}
+    assert GomoryMethod(*problem).integer_solve() == (-25, {'x_1': 3, 'x_2': 0, 'x_3': 4})
+
+
+def test_r_variable_left_in_basis_at_zero_level():
+    problem = (2, ['1x_1 <= 5', '1x_1 + 1x_2 = 2', '4x_1 + 4x_2 >= 8', '1x_2 <= 7'], ('minimize', '- 5x_1'))
+    assert SimplexMethod(*problem).solve() == (-10, {'x_1': 2, 'x_2': 0})
+    assert GomoryMethod(*problem).integer_solve() == (-10, {'x_1': 2, 'x_2': 0})
+
+
+def test_redundant_equality_constraint():
+    problem = (2, ['1x_1 + 1x_2 = 2', '2x_1 + 2x_2 = 4'], ('max', '1x_1 + 3x_2'))
+    assert SimplexMethod(*problem).solve() == (-6, {'x_1': 0, 'x_2': 2})
+
+
+def test_infeasible_problem():
+    with pytest.raises(ValueError, match='Infeasible solution'):
+        SimplexMethod(2, ['1x_1 + 1x_2 >= 5', '1x_1 + 1x_2 <= 2'], ('max', '1x_1 + 1x_2'))
+
+
+def test_pivot_past_int64_bound():
+    big = _simplex_core.INT64_BOUND - 2
+    rows = [[big, 1, 0, 3], [big - 1, -big, 1, 5], [3, 7, -big, 11]]
+    method = SimplexMethod(1, ['1x_1 <= 1', '1x_1 <= 2'], ('max', '1x_1'))
+    for i, row in enumerate(rows):
+        method.simplex_table.set_row(i, np.array(row, dtype=np.int64), 1)
+    for key_column, key_row in ((0, 1), (1, 2)):
+        method.simplex_step(key_column, key_row)
+        rows = [[Fraction(x) for x in row] for row in rows]
+        pivot = rows[key_row][key_column]
+        rows[key_row] = [x / pivot for x in rows[key_row]]
+        for i in range(len(rows)):
+            if i != key_row:
+                factor = rows[i][key_column]
+                rows[i] = [x - factor * y for x, y in zip(rows[i], rows[key_row])]
+    num, den = method.simplex_table.get_arrays()
+    assert num.dtype == object
+    assert method.simplex_table.get_table() == rows
+
+
+def test_objective_row_past_int64_bound():
+    # the common denominator of the basic rows exceeds INT64_BOUND, the product is computed in Python ints
+    d1, d2 = _simplex_core.INT64_BOUND, _simplex_core.INT64_BOUND - 18
+    method = SimplexMethod(2, ['1x_1 <= 1', '1x_2 <= 1'], ('max', '3x_1 + 5x_2'))
+    method.simplex_table.set_row(1, np.array([d1, 0, 1, 0, d1], dtype=np.int64), d1)
+    method.simplex_table.set_row(2, np.array([0, d2, 0, 1, d2], dtype=np.int64), d2)
+    method.basic_vars[1:] = [0, 1]
+    assert method.solve() == (-8, {'x_1': 1, 'x_2': 1})
+    assert method.simplex_table.get_table()[0] == [0, 0, Fraction(-3, d1), Fraction(-5, d2), -8]
+
+
+def test_row_helpers():
+    table = SimplexMethod(2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('maximize', '8x_1 + 6x_2')).simplex_table
+    num, den = table.sum_rows_by_index(1, 2)
+    assert num.tolist() == [6, 6, 1, 1, 35] and den == 1
+    num, den = table.multiply_const_row(Fraction(3, 4), 0)
+    assert num.tolist() == [6, 15, 3, 0, 57] and den == 4
+    table.set_item(1, 1, 1, 3)
+    assert table.get_table()[1] == [2, Fraction(1, 3), 1, 0, 19]
+
+
+def test_revised_simplex_method():
+    problem = (3, ['1x_1 + 1x_2 + 1x_3 <= 7', '2x_1 + 3x_2 <= 13', '1x_2 + 2x_3 <= 9'], ('max', '3x_1 + 2x_2 + 4x_3'))
+    optimum, plane = SimplexMethod(*problem).solve()
+    revised_optimum, revised_plane = RevisedSimplexMethod(*problem).solve()
+    assert type(revised_optimum) is float
+    assert revised_optimum == pytest.approx(float(optimum))
+    assert revised_plane == pytest.approx({var: float(value) for var, value in plane.items()})
+
+
+def test_revised_simplex_method_needs_slack_basis(monkeypatch):
+    monkeypatch.setattr(SimplexMethod, '_phase1', lambda self: pytest.fail('the first phase is run'))
+    with pytest.raises(ValueError, match='slack basis'):
+        RevisedSimplexMethod(2, ['1x_1 + 1x_2 >= 3', '2x_1 + 1x_2 <= 4'], ('min', '3x_1 + 2x_2'))
+
+
+def test_parallel_pivot_matches_serial_kernel():
+    # the table is large enough for pivot to eliminate the rows in parallel
+    size = int(_simplex_core.PARALLEL_THRESHOLD ** 0.5) + 4
+    num = np.random.default_rng(0).integers(-5, 6, size=(size, size))
+    den = np.ones(size, dtype=np.int64)
+    key_row, key_column = 3, 7
+    num[key_row, key_column] = -3
+    expected_num, expected_den = num.copy(), den.copy()
+    _simplex_core.pivot(num, den, key_row, key_column)
+    # the same step with the serial loop over _eliminate_row
+    expected_num[key_row] = -expected_num[key_row]
+    expected_den[key_row] = 3
+    _simplex_core._reduce_row(expected_num, expected_den, key_row)
+    columns = np.flatnonzero(expected_num[key_row])
+    for i in range(size):
+        _simplex_core._eliminate_row(expected_num, expected_den, i, key_row, key_column, columns)
+    assert np.array_equal(num, expected_num) and np.array_equal(den, expected_den)
+
+
+@pytest.mark.parametrize('record_history', [False, True])
+def test_steepest_edge_pricing(record_history):
+    problems = [
+        (2, ['2x_1 + 5x_2 <= 19', '4x_1 + 1x_2 <= 16'], ('maximize', '8x_1 + 6x_2')),
+        (3, ['1x_1 + 1x_2 + 1x_3 = 7', '2x_1 + 3x_2 <= 13', '1x_2 + 2x_3 <= 9'], ('max', '3x_1 + 2x_2 + 4x_3')),
+        (2, ['1x_1 + 1x_2 >= 3', '2x_1 + 1x_2 >= 4'], ('min', '3x_1 + 2x_2')),
+    ]
+    for problem in problems:
+        dantzig = GomoryMethod(*problem, record_history=record_history)
+        steepest_edge = GomoryMethod(*problem, record_history=record_history, pricing='steepest_edge')
+        assert steepest_edge.simplex_vals == dantzig.simplex_vals
+        assert steepest_edge.integer_solve()[0] == dantzig.integer_solve()[0]
+
+
+def test_unknown_pricing_rule():
+    with pytest.raises(ValueError, match='Unknown pricing rule'):
+        SimplexMethod(2, ['2x_1 + 5x_2 <= 19'], ('max', '8x_1 + 6x_2'), pricing='bland')